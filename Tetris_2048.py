@@ -3,8 +3,29 @@ from lib.picture import Picture  # used for displaying images
 from lib.color import Color  # used for coloring the game menu
 import os  # the os module is used for file and directory operations
 from game_grid import GameGrid # the class for modeling the game grid
-from tetromino import Tetromino # the class for modeling the tetrominoes
-import random # used for creating tetrominoes with random types/shapes
+from game_renderer import GameRenderer # the class for displaying the game grid
+from game_clock import GameClock # the class for scheduling the game loop
+from input_handler import InputHandler # the class for reading the typed keys
+from ai_player import HeuristicPlayer # the class for the automated player
+
+# keys used for controlling the active tetromino and the corresponding actions
+# that are applied on the game grid
+KEY_ACTIONS = {
+   "left": "left", # move the active tetromino left by one
+   "right": "right", # move the active tetromino right by one
+   "down": "down", # soft drop: causes the tetromino to fall down faster
+   "d": "clockwise", # rotate the active tetromino clockwise
+   "a": "counterclockwise", # rotate the active tetromino counter-clockwise
+   "space": "drop" # hard drop: causes the tetromino to fall down to the bottom
+}
+# the number of times the input is processed and the game grid is displayed in
+# a second (the tetromino falls down by one every game_speed milliseconds)
+FRAME_RATE = 60
+# the keys repeated while they are held down, the delay before the first repeat
+# (delayed auto shift) and the interval between the repeats (auto repeat rate)
+# in milliseconds
+REPEAT_KEYS = ("left", "right", "down")
+DAS, ARR = 170, 50
 
 # MAIN FUNCTION OF THE PROGRAM
 #----------------------------------------------------------------------
@@ -21,7 +42,7 @@ def start():
    # by using the display_game_menu function defined below
    display_game_menu(16, 17)
    # set game settings
-   game_speed, grid_results, game_type = prepare_screen()
+   game_speed, grid_results, game_type, autoplay = prepare_screen()
    # set the dimensions of the game grid
    grid_h, grid_w = grid_results[1], grid_results[0]
    info_w = 5 # do not change this value
@@ -37,101 +58,89 @@ def start():
 
    # read the best score from the file
    best_score = read_best_score()
-   # set the dimension values stored and used in the Tetromino class
-   Tetromino.grid_height = grid_h
-   Tetromino.grid_width = grid_w
-   # create the game grid
+   # create the game grid (the current and the next tetrominoes to enter the
+   # game grid are created by the game grid)
    grid = GameGrid(grid_h, grid_w, info_w, game_speed, best_score, game_type)
-   # create the first tetromino to enter the game grid
-   # by using the create_tetromino function defined below
-   current_tetromino = create_tetromino(grid_h, grid_w)
-   grid.current_tetromino = current_tetromino
-   # create the next tetromino to enter the game grid
-   # by using the create_tetromino function defined below
-   next_tetromino = create_tetromino(grid_h, grid_w)
-   grid.next_tetromino = next_tetromino
+   # create the renderer used for displaying the game grid
+   renderer = GameRenderer(grid)
+   # create the clock used for running the auto fall every game_speed ms and
+   # processing the input and displaying the game grid FRAME_RATE times in a
+   # second
+   clock = GameClock(game_speed, FRAME_RATE)
+   # create the input handler used for reading the keys typed by the user
+   input_handler = InputHandler(REPEAT_KEYS, DAS, ARR)
+   # create the automated player used for playing the game in the autoplay
+   # mode (the actions for the current tetromino are planned once and applied
+   # one by one at each frame)
+   player = HeuristicPlayer() if autoplay else None
+   planned_tetromino, planned_actions = None, []
    # the main game loop (keyboard interaction for moving the tetromino)
    while True:
-      # check user interactions via the keyboard
-      if stddraw.hasNextKeyTyped():  # check if the user has pressed a key
-         key_typed = stddraw.nextKeyTyped()  # the most recently pressed key
-         # if the left arrow key has been pressed
-         if key_typed == "left":
-            # move the active tetromino left by one
-            current_tetromino.move(key_typed, grid)
-         # if the right arrow key has been pressed
-         elif key_typed == "right":
-            # move the active tetromino right by one
-            current_tetromino.move(key_typed, grid)
-         # if the down arrow key has been pressed
-         elif key_typed == "down":
-            # move the active tetromino down by one
-            # (soft drop: causes the tetromino to fall down faster)
-            current_tetromino.move(key_typed, grid)
-         elif key_typed == "d":
-            # hard drop: causes the tetromino to fall down to the bottom
-            current_tetromino.rotate_tetromino(key_typed, grid)
-         elif key_typed == "a":
-            # rotate the active tetromino counter-clockwise
-            current_tetromino.rotate_tetromino(key_typed, grid)
-         elif key_typed == "space":
-            # hard drop: causes the tetromino to fall down to the bottom
-            while current_tetromino.can_be_moved("down", grid):
-               current_tetromino.move("down", grid)
+      # check user interactions via the keyboard (all the keys typed since the
+      # last frame and the repeats of the held keys are processed in order)
+      for key_typed in input_handler.get_keys():
+         # move/rotate/drop the active tetromino based on the pressed key
+         # (ignored in the autoplay mode)
+         if key_typed in KEY_ACTIONS and not autoplay:
+            grid.apply_action(KEY_ACTIONS[key_typed])
+            # the tetromino is locked right after the hard drop
+            if KEY_ACTIONS[key_typed] == "drop":
+               grid.step()
          elif key_typed == "p":
             # pause the game
-            grid.pause_game_screen()
-         # clear the queue of the pressed keys for a smoother interaction
-         stddraw.clearKeysTyped()
+            renderer.pause_game_screen()
+            clock.reset()
+            input_handler.reset()
+            break
+         if grid.game_over:
+            break
+      # apply the next planned action of the automated player
+      if autoplay and not grid.game_over and grid.current_tetromino is not None:
+         # plan the actions when a new tetromino enters the game grid
+         if grid.current_tetromino is not planned_tetromino:
+            planned_tetromino = grid.current_tetromino
+            planned_actions = list(player.get_actions(grid))
+         if len(planned_actions) > 0:
+            action = planned_actions.pop(0)
+            grid.apply_action(action)
+            # the tetromino is locked right after the hard drop
+            if action == "drop":
+               grid.step()
 
-      # move the active tetromino down by one at each iteration (auto fall)
-      success = current_tetromino.move("down", grid)
-      # place the active tetromino on the grid when it cannot go down anymore
-      if not success:
-         # get the tile matrix of the tetromino without empty rows and columns
-         # and the position of the bottom left cell in this matrix
-         tiles, pos = grid.current_tetromino.get_min_bounded_tile_matrix(True)
-         # update the game grid by locking the tiles of the landed tetromino
-         grid.update_grid(tiles, pos)
-         game_over = grid.game_over
-         # game over menu
-         if game_over:
-            save_best_score(grid.score)
-            is_restarted = game_over_screen(grid_h, game_w, grid.score)
-            if is_restarted:
-               best_score = read_best_score()
-               grid = GameGrid(grid_h, grid_w, info_w, game_speed, best_score, game_type)
-            else:
-               start() # returns the main menu
-         # check if any row is filled and clear this rows
-         grid.clear_tiles()
-         # assign the next tetromino to the current tetromino
-         # by using the create_tetromino function defined below
-         current_tetromino = next_tetromino
-         grid.current_tetromino = current_tetromino
-         # create the next tetromino that will used the next time
-         next_tetromino = create_tetromino(grid_h, grid_w)
-         grid.next_tetromino = next_tetromino
+      # move the active tetromino down by one at each tick of the clock (auto 
+      # fall), the tetromino is placed on the grid when it cannot go down
+      for _ in range(clock.ticks()):
+         grid.step()
+         if grid.game_over:
+            break
+      # game over menu
+      if grid.game_over:
+         save_best_score(grid.score)
+         is_restarted = game_over_screen(grid_h, game_w, grid.score)
+         if is_restarted:
+            best_score = read_best_score()
+            grid = GameGrid(grid_h, grid_w, info_w, game_speed, best_score, game_type)
+            renderer = GameRenderer(grid)
+            clock.reset()
+         else:
+            start() # returns the main menu
 
       # display the game grid and the current tetromino
-      grid.display()
+      renderer.display()
+      # check if the stop or the pause button is pressed
+      button = renderer.check_buttons()
+      if button == "pause":
+         renderer.pause_game_screen()
+         clock.reset()
+         input_handler.reset()
       # if stop game button is pressed, displyas the game over screen
-      game_over = grid.game_over
-      if game_over:
+      elif button == "stop":
          save_best_score(grid.score)
          is_returned = stop_screen(grid_h, game_w, grid.score)
          if is_returned:
             start()
-
-# Function for creating random shaped tetrominoes to enter the game grid
-def create_tetromino(grid_height, grid_width):
-   # type (shape) of the tetromino is determined randomly
-   tetromino_types = ["I", "J", "L", "O", "S", "T", "Z"]
-   random_index = random.randint(0, len(tetromino_types) - 1)
-   random_type = tetromino_types[random_index]
-   # create and return the tetromino
-   tetromino = Tetromino(random_type)
-   return tetromino
+      # wait until the next frame
+      clock.wait_for_next_frame()
 
 # Function for displaying a simple menu before starting the game
 def display_game_menu(grid_height, grid_width):
@@ -180,7 +189,7 @@ def display_game_menu(grid_height, grid_width):
 
 # Function promps, when the game is initialized at the first.
 # It gets the values of grid @(n)x@(p) and the game speed @(speed) from the user.
-# @return it returns the speed of the game, which is delay of game. And a tuple of dimensions of the wanted grid.
+# @return it returns the speed of the game, which is delay of game. And a tuple of dimensions of the wanted grid, the game type and whether the autoplay mode is selected.
 def prepare_screen():
    # setting default colors.
    background_color = Color(42, 69, 99); button_color = Color(25, 255, 228); text_color = Color(31, 160, 239); black_color = Color(0, 0, 0); white_color = Color(255, 255, 255)
@@ -196,6 +205,8 @@ def prepare_screen():
    gameSpeed = 0
    # setting a default game type.
    game_type = ""
+   # the autoplay mode (the game is played by the automated player) is off by default.
+   autoplay = False
    # a loop that runs the window fully, it draw all neccessary elements, and gets input from the user.
    while True:
       # clearing the background, to be able to create an doubleBuffering affect on canvas
@@ -218,6 +229,9 @@ def prepare_screen():
       stddraw.setPenColor(black_color); stddraw.boldText(250,265,"Welcome to Tetris 2048 !"); stddraw.boldText(250,240,"< To Play > Press -"); stddraw.boldText(250,215,"Left and Right Arrow buttons to"); stddraw.boldText(250,200,"- Move tetromino left and right"); stddraw.boldText(250,175,"Down arrow button to"); stddraw.boldText(250,160,"- Move tetromino down faster"); stddraw.boldText(250,135,"\"Space\" to - Directly fall tetromino"); stddraw.boldText(250,110,"\"A\" and \"D\" to"); stddraw.boldText(250,95,"Rotate tetromino clockwise and c-clockwise"); stddraw.boldText(250,70,"\"P\" to - Pause the game")
       # drawing the texts of game mod buttons
       stddraw.setPenColor(black_color); stddraw.boldText(125,340,"EASY"); stddraw.boldText(250,340,"MEDIUM"); stddraw.boldText(375,340,"HARD")
+      # drawing the autoplay toggle button and its text
+      stddraw.setPenColor(white_color if autoplay else button_color); stddraw.filledRectangle(175,15,150,30)
+      stddraw.setPenColor(black_color); stddraw.boldText(250,30,"AUTOPLAY : " + ("ON" if autoplay else "OFF"))
       # drawing slider circles boundaries
       stddraw.setPenColor(background_color); stddraw.filledCircle(gridDimensions[0],455,18); stddraw.filledCircle(gridDimensions[1],405,18)
       # drawing slider circle inside
@@ -233,11 +247,12 @@ def prepare_screen():
          # getting mouse position after check
          mouse_x, mouse_y = stddraw.mouseX(), stddraw.mouseY()
          # catching the game type option and slider buttons
-         if   ((mouse_x >= 125-75/2 and mouse_x <= 125-75/2 + 40) and (mouse_y >= (320) and mouse_y <= (320) + 40)): gameSpeed = 400; game_type = "easy";   return gameSpeed, tuple(gridResults), game_type
-         elif ((mouse_x >= 250-75/2 and mouse_x <= 250-75/2 + 40) and (mouse_y >= (320) and mouse_y <= (320) + 40)): gameSpeed = 250; game_type = "medium"; return gameSpeed, tuple(gridResults), game_type
-         elif ((mouse_x >= 375-75/2 and mouse_x <= 375-75/2 + 40) and (mouse_y >= (320) and mouse_y <= (320) + 40)): gameSpeed = 150; game_type = "hard";   return gameSpeed, tuple(gridResults), game_type
+         if   ((mouse_x >= 125-75/2 and mouse_x <= 125-75/2 + 40) and (mouse_y >= (320) and mouse_y <= (320) + 40)): gameSpeed = 400; game_type = "easy";   return gameSpeed, tuple(gridResults), game_type, autoplay
+         elif ((mouse_x >= 250-75/2 and mouse_x <= 250-75/2 + 40) and (mouse_y >= (320) and mouse_y <= (320) + 40)): gameSpeed = 250; game_type = "medium"; return gameSpeed, tuple(gridResults), game_type, autoplay
+         elif ((mouse_x >= 375-75/2 and mouse_x <= 375-75/2 + 40) and (mouse_y >= (320) and mouse_y <= (320) + 40)): gameSpeed = 150; game_type = "hard";   return gameSpeed, tuple(gridResults), game_type, autoplay
          elif ((mouse_y >= (450) - 15 and mouse_y <= (450) + 20)  and (mouse_x >= 280-300/2 and mouse_x <= 280-300/2 + 300)) : gridDimensions[0] = (mouse_x); gridResults[0] = pixelToCoordinate(mouse_x,130,430,8,20 )
          elif ((mouse_y >= (400) - 15 and mouse_y <= (400) + 20   and (mouse_x >= 280-300/2 and mouse_x <= 280-300/2 + 300))): gridDimensions[1] = (mouse_x); gridResults[1] = pixelToCoordinate(mouse_x,130,430,16,24)
+         elif ((mouse_x >= 175 and mouse_x <= 175 + 150) and (mouse_y >= 15 and mouse_y <= 15 + 30)): autoplay = not autoplay
 # Function for displaying the game over screen
 def game_over_screen(grid_h, game_w, current_score):
    # colors used for the menu
@@ -0,0 +1,121 @@
+import numpy as np  # fundamental Python module for scientific computing
+from transposition_cache import TranspositionCache  # caches the placements
+
+# The features of a game grid used for evaluating the placements of the 
+# tetrominoes: the number of the empty cells below the highest tile in each 
+# column (holes), the sum of the height differences of the adjacent columns 
+# (bumpiness), the sum of the column heights (aggregate height), the number of 
+# the horizontally adjacent tiles with the same number (mergeable pairs), the 
+# exponent of the max tile number on the grid (max tile) and the score gained
+FEATURES = ("holes", "bumpiness", "aggregate_height", "mergeable_pairs",
+            "max_tile", "score")
+
+# The default weights of the features
+DEFAULT_WEIGHTS = {"holes": -4.0, "bumpiness": -0.6, "aggregate_height": -0.5,
+                   "mergeable_pairs": 0.5, "max_tile": 1.0, "score": 0.05}
+
+# Function that returns the features (in the order of FEATURES) of the given 
+# game grid where the score is counted from the given initial score
+def get_features(grid, initial_score = 0):
+   heights = grid.column_heights
+   aggregate_height = sum(heights)
+   holes = aggregate_height - sum(grid.row_fills)
+   bumpiness = sum(abs(heights[i] - heights[i + 1]) for i in range(len(heights) - 1))
+   tiles = grid.tile_matrix
+   mergeable_pairs = int(np.count_nonzero((tiles[:, :-1] == tiles[:, 1:]) & (tiles[:, 1:] != 0)))
+   max_tile = int(tiles.max())
+   return (holes, bumpiness, aggregate_height, mergeable_pairs, max_tile,
+           grid.score - initial_score)
+
+# Class used for modeling an automated player that chooses the placement of 
+# the current tetromino (see GameGrid.get_placements) by a beam search over the 
+# placements of the current and the next tetrominoes where the game grids are
+# evaluated by a weighted sum of their features. The features of the grid 
+# reached by each placement are cached by the hash of the grid before the 
+# placement and the placed tiles as the same grids are reached again (e.g. the
+# placements of the next tetromino are searched again when it becomes the 
+# current tetromino).
+class HeuristicPlayer:
+   # Constructor for creating a player with the given feature weights (the 
+   # default weights for the missing features), the number of the best 
+   # placements of the current tetromino searched with the next tetromino and
+   # the max number of the cached placements (no cache when it is 0)
+   def __init__(self, weights = None, beam_width = 2, cache_size = 2 ** 16):
+      weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+      self.weights = tuple(weights[feature] for feature in FEATURES)
+      self.beam_width = beam_width
+      self.cache = TranspositionCache(cache_size) if cache_size > 0 else None
+      # the copies of the game grid used for trying the placements (created
+      # once for each game grid size and reused)
+      self.scratch_grids = None
+
+   # Method that returns the evaluation (a weighted sum of the features where
+   # higher is better) of the game grid reached by locking the given placement
+   # on the given game grid (with the given hash) where the score is counted 
+   # from the given initial score. The placement is tried on 
+   # the given scratch grid when its features are not cached.
+   def evaluate_placement(self, grid, grid_hash, placement, scratch, initial_score):
+      key = (grid_hash, placement.cells)
+      features = self.cache.lookup(key) if self.cache is not None else None
+      if features is None:
+         scratch.copy_from(grid)
+         scratch.lock_cells(placement.cells)
+         # the score feature is the score gained by the placement (an empty 
+         # tuple is cached when the game is over)
+         features = () if scratch.game_over else get_features(scratch, grid.score)
+         if self.cache is not None:
+            self.cache.store(key, features)
+      if len(features) == 0:
+         return float("-inf")
+      evaluation = sum(weight * value for weight, value in zip(self.weights, features))
+      # add the score gained before the placement
+      return evaluation + self.weights[FEATURES.index("score")] * (grid.score - initial_score)
+
+   # Method that returns the hash of the given game grid used for caching the
+   # placements on it (None when there is no cache)
+   def hash_grid(self, grid):
+      return self.cache.hash_grid(grid) if self.cache is not None else None
+
+   # Method that returns the grid copies used for the search
+   def get_scratch_grids(self, grid):
+      if self.scratch_grids is None or \
+         self.scratch_grids[0].tile_matrix.shape != grid.tile_matrix.shape:
+         self.scratch_grids = (grid.copy(), grid.copy())
+      return self.scratch_grids
+
+   # Method that returns the best placement of the current tetromino on the 
+   # given game grid or None when there is no placement
+   def choose_placement(self, grid):
+      placements = grid.get_placements()
+      if len(placements) == 0:
+         return None
+      first, second = self.get_scratch_grids(grid)
+      # evaluate the placements of the current tetromino
+      grid_hash = self.hash_grid(grid)
+      evaluations = [self.evaluate_placement(grid, grid_hash, placement, first, grid.score)
+                     for placement in placements]
+      order = sorted(range(len(placements)), key=lambda i: evaluations[i], reverse=True)
+      if grid.next_tetromino is None:
+         return placements[order[0]]
+      # evaluate the best placements together with the best placement of the 
+      # next tetromino after each of them
+      best_placement, best_evaluation = placements[order[0]], float("-inf")
+      for i in order[:self.beam_width]:
+         first.copy_from(grid)
+         if first.lock_cells(placements[i].cells):
+            continue
+         evaluation, first_hash = float("-inf"), self.hash_grid(first)
+         for next_placement in first.get_placements(grid.next_tetromino):
+            evaluation = max(evaluation, self.evaluate_placement(
+               first, first_hash, next_placement, second, grid.score))
+         if evaluation > best_evaluation:
+            best_placement, best_evaluation = placements[i], evaluation
+      return best_placement
+
+   # Method that returns the actions for moving the current tetromino on the
+   # given game grid to its best placement and dropping it
+   def get_actions(self, grid):
+      placement = self.choose_placement(grid)
+      if placement is None:
+         return ()
+      return placement.actions
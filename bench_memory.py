@@ -0,0 +1,58 @@
+import sys  # used for the command line arguments
+import tracemalloc  # used for measuring the allocated memory
+from tile import Tile  # the class for modeling the tiles
+from point import Point  # the class for modeling the positions
+from game_grid import GameGrid  # the class for modeling the game grid
+from utils import TILE_COLORS  # used for the tile colors of the baseline tiles
+
+# The baseline classes as Color, Tile and Point were before they got __slots__:
+# each object has an instance dictionary and each tile has its own box color
+class DictColor:
+   def __init__(self, r = 0, g = 0, b = 0):
+      self._r, self._g, self._b = r, g, b
+
+class DictTile:
+   def __init__(self, number = 2):
+      self.number = number
+      self.box_color = DictColor(132, 122, 113)
+      self.background_color = TILE_COLORS[number]['background_color']
+      self.foreground_color = TILE_COLORS[number]['foreground_color']
+
+class DictPoint:
+   def __init__(self, x = 0, y = 0):
+      self.x = x
+      self.y = y
+
+# Function that returns the number of bytes allocated for creating the given 
+# number of objects with the given function (the list holding the objects is 
+# not counted)
+def measure(create, n_objects):
+   objects = [None] * n_objects
+   tracemalloc.start()
+   for i in range(n_objects):
+      objects[i] = create()
+   size = tracemalloc.get_traced_memory()[0]
+   tracemalloc.stop()
+   return size
+
+# Memory benchmark for the tiles and the positions of a full game grid before
+# (the baseline classes) and after (the classes with __slots__) where the grid
+# dimensions can be given as the command line arguments
+# (python bench_memory.py [grid_height] [grid_width])
+def main():
+   grid_h = int(sys.argv[1]) if len(sys.argv) > 1 else 24
+   grid_w = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+   n_cells = grid_h * grid_w
+   print("full grid: %d x %d = %d tiles" % (grid_h, grid_w, n_cells))
+   for name, before, after in (("Tile", DictTile, Tile), ("Point", DictPoint, Point)):
+      before_bytes, after_bytes = measure(before, n_cells), measure(after, n_cells)
+      print("%s objects: before %d bytes (%.1f per object), after %d bytes (%.1f per object)"
+            % (name, before_bytes, before_bytes / n_cells, after_bytes, after_bytes / n_cells))
+   # the tiles locked on the game grid are stored in the tile matrix
+   grid = GameGrid(grid_h, grid_w, 5, 0, 0, "easy")
+   grid.tile_matrix[:, :] = 1
+   print("GameGrid.tile_matrix: %d bytes (%.1f bytes per tile)"
+         % (grid.tile_matrix.nbytes, grid.tile_matrix.nbytes / n_cells))
+
+if __name__ == '__main__':
+   main()
@@ -0,0 +1,47 @@
+import time  # the monotonic clock is used for measuring the elapsed time
+
+# Class used for scheduling the game with a fixed timestep: the game is 
+# advanced by one tick (auto fall) every tick_ms milliseconds independently 
+# of the frame rate while the input is processed and the game grid is 
+# displayed fps times in a second
+class GameClock:
+   # Constructor for creating a game clock with the given tick duration (in 
+   # milliseconds) and the target frame rate (frames per second)
+   def __init__(self, tick_ms, fps = 60, max_ticks = 5):
+      self.tick_duration = tick_ms / 1000
+      self.frame_duration = 1 / fps
+      # the max number of ticks run in a frame (the remaining ticks are dropped
+      # when the game cannot keep up with the clock)
+      self.max_ticks = max_ticks
+      self.reset()
+
+   # Method that restarts the clock (e.g. after the game is paused) so that 
+   # the time passed before is not taken into account
+   def reset(self):
+      now = time.monotonic()
+      # the time that is not consumed by the ticks yet
+      self.accumulator = 0.0
+      self.last_time = now
+      # the time when the next frame starts
+      self.next_frame_time = now + self.frame_duration
+
+   # Method that returns the number of ticks to run for the time passed since
+   # the last call
+   def ticks(self):
+      now = time.monotonic()
+      self.accumulator += now - self.last_time
+      self.last_time = now
+      n_ticks = int(self.accumulator // self.tick_duration)
+      self.accumulator -= n_ticks * self.tick_duration
+      return min(n_ticks, self.max_ticks)
+
+   # Method that waits until the next frame starts
+   def wait_for_next_frame(self):
+      now = time.monotonic()
+      if now < self.next_frame_time:
+         time.sleep(self.next_frame_time - now)
+         self.next_frame_time += self.frame_duration
+      # start the next frame from now when the frame took longer than the 
+      # frame duration
+      else:
+         self.next_frame_time = now + self.frame_duration
@@ -1,18 +1,33 @@
-import os
-import lib.stddraw as stddraw  # stddraw is used as a basic graphics library
+import random # used for the random number generators of the games
 import numpy as np  # fundamental Python module for scientific computing
-import copy as cp  # the copy module is used for copying tetrominos
+from collections import namedtuple  # used for the placements
 from tile import Tile  # the class for modeling the tiles
-from lib.picture import Picture  # used for displaying images
-from lib.color import Color # used for coloring the game grid
-from point import Point  # used for tile positions
-from utils import get_next_display_dict
-from tetromino import Tetromino  # the class for modeling the tetrominos
+from tetromino import Tetromino, TETROMINO_TYPES  # used for the tetrominos
 
-# Class used for modelling the game grid
+# The rotation systems used for the game types: the tetromino is only rotated 
+# in place with "classic" while "srs" tries the wall kicks of the Super Rotation 
+# System when the tetromino cannot be rotated in place
+ROTATION_SYSTEMS = {"easy": "srs", "medium": "srs", "hard": "classic"}
+
+# A final position of a tetromino that can be reached from its current position:
+# the rotation index and the bottom left cell (x, y) of the landed tetromino,
+# the actions applied to the tetromino for reaching the position (rotations, 
+# horizontal moves and a hard drop) and the (x, y, exponent) tuples of the 
+# tiles locked on the game grid (the changes on the tile matrix before the 
+# rows are cleared and the tiles are merged)
+Placement = namedtuple("Placement", ["rotation", "x", "y", "actions", "cells"])
+
+# The rotations tried for the placements as the number of clockwise rotations
+# and the actions applied for them
+PLACEMENT_ROTATIONS = ((0, ()), (1, ("clockwise",)), 
+                       (2, ("clockwise", "clockwise")), (3, ("counterclockwise",)))
+
+# Class used for modelling the game grid, i.e. the game logic without any
+# drawing (see GameRenderer for displaying the game grid with stddraw)
 class GameGrid:
 	# Constructor for creating the game grid based on the given arguments
-   def __init__(self, grid_h, grid_w, info_w, game_speed, best_score, game_type):
+   def __init__(self, grid_h, grid_w, info_w, game_speed, best_score, game_type,
+                rotation_system = None, seed = None, rng = None):
       # set the dimensions of the game grid as the given arguments
       self.grid_height = grid_h
       self.grid_width = grid_w
@@ -20,140 +35,272 @@ class GameGrid:
       self.game_width = self.grid_width + self.info_width
       # set the game type as the given argument
       self.game_type = game_type
+      # set the rotation system as the given argument or based on the game type
+      if rotation_system is None:
+         rotation_system = ROTATION_SYSTEMS.get(game_type, "classic")
+      self.rotation_system = rotation_system
+      # create the random number generator used for the types, the positions
+      # and the tile numbers of the tetrominoes (a game can be reproduced by 
+      # using the same seed, a random seed is chosen when it is not given)
+      if rng is None:
+         if seed is None:
+            seed = random.randrange(2 ** 32)
+         rng = random.Random(seed)
+      self.seed = seed
+      self.rng = rng
       # set the game speed as the given argument
       self.game_speed = game_speed
       # set the best score as the given argument
       self.best_score = best_score
-      # create a tile matrix to store the tiles landed onto the game grid
-      self.tile_matrix = np.full((grid_h, grid_w), None)
+      # create a tile matrix to store the tiles landed onto the game grid as
+      # the exponents of their numbers (log2 of the number, 0 = empty cell)
+      self.tile_matrix = np.zeros((grid_h, grid_w), dtype=np.uint8)
+      # create the occupancy bitboard of the game grid (one integer bitmask per
+      # row where bit col is set when the cell at col is occupied) that is kept
+      # in sync with the tile matrix for fast collision checks
+      self.row_masks = [0] * grid_h
+      # the occupancy bitmasks of the columns (bit row is set when the cell at
+      # row is occupied) used for finding where the tetrominoes land
+      self.column_masks = [0] * grid_w
+      # the number of the occupied cells in each row and the height of each 
+      # column (the index of its highest occupied cell + 1) that are updated 
+      # together with the bitmasks (see the row_fills and column_heights 
+      # properties)
+      self._row_fills = [0] * grid_h
+      self._column_heights = [0] * grid_w
+      # the indexes of the columns changed since the last merge (the merges are
+      # only performed after the tile matrix is changed)
+      self.changed_columns = set()
       # create the tetromino that is currently being moved on the game grid
       self.current_tetromino = None
       #create the next tetromino that is to be moved on the game grid
       self.next_tetromino = None
       # the game_over flag shows whether the game is over or not
       self.game_over = False
-      # set the color used for the empty grid cells
-      self.empty_cell_color = Color(206, 195, 181)
-      # set the colors used for the grid lines and the grid boundaries
-      self.line_color = Color(185, 171, 158) 
-      self.boundary_color = Color(132, 122, 113)
-      # thickness values used for the grid lines and the boundaries
-      self.line_thickness = 0.005
-      self.box_thickness = 2.5 * self.line_thickness
-      self.info_line_thickness = 3 * self.line_thickness
       # set the score to 0
       self.score = 0
+      # the statistics of the game: the number of the cleared rows, the number
+      # of the tetrominoes locked on the game grid and the max tile number
+      self.lines_cleared = 0
+      self.pieces_placed = 0
+      self.max_tile = 0
+      # create the current and the next tetromino to enter the game grid
+      self.spawn_tetromino()
 
-   # Method used for displaying the game grid
-   def display(self):
-      # clear the background to empty_cell_color
-      stddraw.clear(self.empty_cell_color)
-      # draw the game grid
-      self.draw_grid()
-      # draw the current/active tetromino if it is not None (the case when the 
-      # game grid is updated)
-      if self.current_tetromino is not None:
-         self.current_tetromino.draw()
-         # ghost tetromino for help the user in game modes easy and medium
-         if self.game_type != "hard":
-            self.ghost_tetromino() 
-      self.score = Tile.merge_tiles(self.tile_matrix, self.score)
-      # draw the score and the next tetromino
-      self.draw_info()
-      # draw a box around the game grid 
-      self.draw_boundaries()
-      # show the resulting drawing with a pause duration = 250 ms
-      stddraw.show(self.game_speed)
-         
-   # Method for drawing the cells and the lines of the game grid
-   def draw_grid(self):
-      # for each cell of the game grid
-      for row in range(self.grid_height):
-         for col in range(self.grid_width):
-            # draw the tile if the grid cell is occupied by a tile
-            if self.tile_matrix[row][col] is not None:
-               self.tile_matrix[row][col].draw(Point(col, row))
-      # draw the inner lines of the grid
-      stddraw.setPenColor(self.line_color)
-      stddraw.setPenRadius(self.line_thickness)
-      # x and y ranges for the game grid
-      start_x, end_x = -0.5, self.grid_width - 0.5
-      start_y, end_y = -0.5, self.grid_height - 0.5
-      for x in np.arange(start_x + 1, end_x, 1):  # vertical inner lines
-         stddraw.line(x, start_y, x, end_y)
-      for y in np.arange(start_y + 1, end_y, 1):  # horizontal inner lines
-         stddraw.line(start_x, y, end_x, y)
-      stddraw.setPenRadius()  # reset the pen radius to its default value            
-      
-   # Method for drawing the boundaries around the game grid 
-   def draw_boundaries(self):
-      # draw a bounding box around the game grid as a rectangle
-      stddraw.setPenColor(self.boundary_color)  # using boundary_color
-      # set the pen radius as box_thickness (half of this thickness is visible 
-      # for the bounding box as its lines lie on the boundaries of the canvas)
-      stddraw.setPenRadius(self.box_thickness)
-      # the coordinates of the bottom left corner of the game grid
-      pos_x, pos_y = -0.5, -0.5
-      stddraw.rectangle(pos_x, pos_y, self.grid_width, self.grid_height)
-      # set pen radius for info box boundaries
-      stddraw.setPenRadius(self.info_line_thickness)
-      stddraw.rectangle(self.grid_width - 0.5, pos_y, self.info_width, self.grid_height)
-      stddraw.setPenRadius()  # reset the pen radius to its default value
-   
-   # Method for drawing the score and the next tetromino
-   def draw_info(self):
-      # info grid settings
-      stddraw.setPenColor(Color(167, 160, 151))
-      stddraw.filledRectangle(self.grid_width - 0.5, -0.5, self.info_width, self.grid_height)
-      info_center_x_scale = (self.grid_width + self.info_width / 2) - 0.5
-      info_score_y_scale = (self.grid_height - 2)
-      # draw the score
-      stddraw.setPenColor(Color(255, 255, 255))
-      stddraw.setFontFamily("Arial")
-      stddraw.setFontSize(25)
-      stddraw.boldText(info_center_x_scale, info_score_y_scale, "Score")
-      stddraw.boldText(info_center_x_scale, info_score_y_scale - 0.75, str(self.score))
-      # draw the best score
-      stddraw.setFontSize(15)
-      stddraw.boldText(info_center_x_scale, info_score_y_scale - 2, "Best Score")
-      stddraw.boldText(info_center_x_scale, info_score_y_scale - 2.50, str(self.best_score))
-      # draw the next tetromino
-      stddraw.boldText(info_center_x_scale, 5, "Next")
-      if self.next_tetromino is not None:
-         next_display = cp.deepcopy(self.next_tetromino)
-         next_display.bottom_left_cell = Point()
-         tile_next_display = get_next_display_dict(self.grid_width)
-         next_display.bottom_left_cell.x  = tile_next_display[next_display.type]['x']
-         next_display.bottom_left_cell.y  = tile_next_display[next_display.type]['y']
-         next_display.draw()
+   # Property that returns the number of the occupied cells in each row
+   @property
+   def row_fills(self):
+      return tuple(self._row_fills)
+
+   # Property that returns the height of each column, i.e. the index of the 
+   # highest occupied cell in the column + 1 (0 for an empty column)
+   @property
+   def column_heights(self):
+      return tuple(self._column_heights)
+
+   # Method for creating random shaped tetrominoes to enter the game grid
+   def create_tetromino(self):
+      # type (shape) of the tetromino is determined randomly
+      random_index = self.rng.randint(0, len(TETROMINO_TYPES) - 1)
+      random_type = TETROMINO_TYPES[random_index]
+      # create and return the tetromino
+      tetromino = Tetromino(random_type, self.rng, self.grid_width, self.grid_height)
+      return tetromino
+
+   # Method that assigns the next tetromino to the current tetromino and 
+   # creates the next tetromino that will be used the next time
+   def spawn_tetromino(self):
+      if self.next_tetromino is None:
+         self.next_tetromino = self.create_tetromino()
+      self.current_tetromino = self.next_tetromino
+      self.next_tetromino = self.create_tetromino()
 
-      # Stop Game button
-      stddraw.setPenColor(self.boundary_color)
-      stddraw.filledRectangle(self.grid_width + 0.5, self.grid_height / 2 + 1, self.info_width - 2, 1)
-      stddraw.setPenColor(Color(255, 255, 255))
-      stddraw.setFontFamily("Arial")
-      stddraw.setFontSize(20)
-      stddraw.boldText(self.grid_width + 2, self.grid_height / 2 + 1.5, "Stop")
-      # Pause Game button
-      stddraw.setPenColor(self.boundary_color)
-      stddraw.filledRectangle(self.grid_width + 0.5, self.grid_height / 2 - 0.25, self.info_width - 2, 1)
-      stddraw.setPenColor(Color(255, 255, 255))
-      stddraw.setFontFamily("Arial")
-      stddraw.setFontSize(20)
-      stddraw.boldText(self.grid_width + 2, self.grid_height / 2 + 0.25, "Pause")
+   # Method that applies the given action to the current tetromino where the
+   # action is one of "left", "right", "down" (soft drop), "clockwise", 
+   # "counterclockwise" (rotations) and "drop" (hard drop). The method returns 
+   # True when the current tetromino is moved or rotated and False otherwise.
+   def apply_action(self, action):
+      if self.game_over or self.current_tetromino is None:
+         return False
+      if action in ("left", "right", "down"):
+         return self.current_tetromino.move(action, self)
+      if action in ("clockwise", "counterclockwise"):
+         return self.current_tetromino.rotate_tetromino(action, self)
+      if action == "drop":
+         return self.hard_drop()
+      raise ValueError("unknown action: " + str(action))
+
+   # Method that moves the current tetromino down until it lands (hard drop)
+   def hard_drop(self):
+      distance = self.current_tetromino.get_drop_distance(self)
+      self.current_tetromino.bottom_left_cell.y -= distance
+      return distance > 0
 
-      if stddraw.mousePressed():
-         # get the x and y coordinates of the location at which the mouse has 
-         # most recently been left-clicked  
-         mouse_x, mouse_y = stddraw.mouseX(), stddraw.mouseY()
-         # check if these coordinates are inside the stop button
-         if mouse_x >= self.grid_width + 0.5 and mouse_x <= self.grid_width + self.info_width - 1.5:
-            if mouse_y >= self.grid_height / 2 + 1 and mouse_y <= self.grid_height / 2 + 2:
-               self.game_over = True
-         # check if these coordinates are inside the pause button
-         if mouse_x >= self.grid_width + 0.5 and mouse_x <= self.grid_width + self.info_width - 1.5:
-            if mouse_y >= self.grid_height / 2 - 0.25 and mouse_y <= self.grid_height / 2 + 0.75:
-               self.pause_game_screen()
+   # Method that returns the placements (see Placement) of the given tetromino 
+   # (the current tetromino by default) that are reached by rotating the 
+   # tetromino in place, moving it left or right and dropping it, i.e. each
+   # reachable (rotation, x) pair is found in a single pass without moving the
+   # tetromino or copying the game grid
+   def get_placements(self, tetromino = None):
+      if tetromino is None:
+         tetromino = self.current_tetromino
+      placements = []
+      if tetromino is None or self.game_over:
+         return placements
+      x, y = tetromino.bottom_left_cell.x, tetromino.bottom_left_cell.y
+      for turns, rotation_actions in PLACEMENT_ROTATIONS:
+         # each rotation on the way must fit on the game grid at (x, y)
+         if turns == 3:
+            path = [(tetromino.rotation - 1) % 4]
+         else:
+            path = [(tetromino.rotation + i) % 4 for i in range(turns + 1)]
+         if not all(tetromino.fits(self, x, y, rotation) for rotation in path):
+            continue
+         rotation = path[-1]
+         cells = tetromino.rotation_states[rotation].cells
+         # move the tetromino left and right until it does not fit
+         for direction, step in (("left", -1), ("right", 1)):
+            new_x = x if step == -1 else x + 1
+            while tetromino.fits(self, new_x, y, rotation):
+               new_y = y - tetromino.get_drop_distance(self, new_x, y, rotation)
+               actions = rotation_actions + (direction,) * abs(new_x - x) + ("drop",)
+               locked = tuple((new_x + dx, new_y + dy, tile.get_exponent())
+                              for (dx, dy), tile in zip(cells, tetromino.tiles))
+               placements.append(Placement(rotation, new_x, new_y, actions, locked))
+               new_x += step
+      return placements
+
+   # Method that advances the game by one tick: the current tetromino is moved
+   # down by one (auto fall) and it is locked on the game grid when it cannot 
+   # go down anymore. The method returns True when a tetromino is locked.
+   def step(self):
+      if self.game_over:
+         return False
+      locked = False
+      # move the active tetromino down by one (auto fall)
+      if not self.current_tetromino.move("down", self):
+         self.lock_tetromino()
+         locked = True
+      return locked
+
+   # Method that locks the current tetromino on the game grid, clears the 
+   # filled rows and creates the next tetromino when the game is not over
+   def lock_tetromino(self):
+      # get the positions of the tiles of the landed tetromino and the 
+      # exponents of their numbers
+      cells = [(x, y, tile.get_exponent())
+               for x, y, tile in self.current_tetromino.get_cells()]
+      # lock the tiles, clear the filled rows and merge the tiles
+      if self.lock_cells(cells):
+         return
+      # assign the next tetromino to the current tetromino
+      self.spawn_tetromino()
+
+   # Method that locks the tiles given as (x, y, exponent) tuples (e.g. the 
+   # cells of a placement) on the game grid, clears the filled rows and merges
+   # the tiles. The method returns True when the game is over.
+   def lock_cells(self, cells):
+      self.pieces_placed += 1
+      # update the game grid by locking the tiles of the landed tetromino
+      if self.update_grid(cells):
+         return True
+      # check if any row is filled and clear this rows
+      lines_cleared = self.lines_cleared
+      self.clear_tiles()
+      # nothing is merged or moved down when no row is cleared and no locked 
+      # tile is on or under a tile with the same number (the tiles of a
+      # tetromino always have neighbours and the merges before are completed)
+      if self.lines_cleared == lines_cleared and not self.has_equal_vertical_pair(cells):
+         self.changed_columns.clear()
+         return False
+      # merge the tiles with the same number in the changed columns
+      self.merge_tiles()
+      return False
+
+   # Method that checks whether any of the given (x, y, exponent) cells is on 
+   # or under a tile with the same number on the game grid
+   def has_equal_vertical_pair(self, cells):
+      for x, y, exponent in cells:
+         if y > 0 and self.tile_matrix[y - 1][x] == exponent:
+            return True
+         if y < self.grid_height - 1 and self.tile_matrix[y + 1][x] == exponent:
+            return True
+      return False
+
+   # Method that copies the tiles, the score and the statistics of the given 
+   # game grid with the same dimensions onto this game grid without creating 
+   # new objects (the tetrominoes are not copied)
+   def copy_from(self, other):
+      np.copyto(self.tile_matrix, other.tile_matrix)
+      self.row_masks[:] = other.row_masks
+      self.column_masks[:] = other.column_masks
+      self._row_fills[:] = other._row_fills
+      self._column_heights[:] = other._column_heights
+      self.changed_columns.clear()
+      self.changed_columns.update(other.changed_columns)
+      self.current_tetromino = self.next_tetromino = None
+      self.game_over = other.game_over
+      self.score = other.score
+      self.lines_cleared = other.lines_cleared
+      self.pieces_placed = other.pieces_placed
+      self.max_tile = other.max_tile
+
+   # Method that returns a copy of the game grid (see copy_from) that can be
+   # used for trying the placements of the tetrominoes
+   def copy(self):
+      grid = GameGrid(self.grid_height, self.grid_width, self.info_width,
+                      self.game_speed, self.best_score, self.game_type,
+                      self.rotation_system, seed=0)
+      grid.copy_from(self)
+      return grid
+
+   # Method that merges the tiles with the same number in the changed columns
+   # and updates the score. The merge pass is repeated until nothing changes 
+   # where each pass is restricted to the columns changed by the previous pass
+   # (and their neighbours as the tiles without neighbours fall down).
+   def merge_tiles(self):
+      changed_columns = sorted(self.changed_columns)
+      self.changed_columns = set()
+      while len(changed_columns) > 0:
+         # the range of the columns to merge
+         start = max(changed_columns[0] - 1, 0)
+         end = min(changed_columns[-1] + 2, self.grid_width)
+         left_column = self.tile_matrix[:, start - 1] if start > 0 else None
+         right_column = self.tile_matrix[:, end] if end < self.grid_width else None
+         merged, score_delta = Tile.merge_tiles(self.tile_matrix[:, start:end],
+                                                left_column, right_column)
+         self.score += score_delta
+         self.max_tile = max(self.max_tile, int(Tile.numbers[merged.max()]))
+         # find the columns changed by the merge pass
+         changed = (merged != self.tile_matrix[:, start:end]).any(axis=0)
+         changed_columns = list(start + np.nonzero(changed)[0])
+         self.tile_matrix[:, start:end] = merged
+         # the merged tiles are removed and moved down on the tile matrix
+         if len(changed_columns) > 0:
+            self.update_row_masks()
+            self.update_column_masks()
+
+   # Method that recomputes the occupancy bitmasks of the rows from the tile 
+   # matrix
+   def update_row_masks(self):
+      occupied = self.tile_matrix != 0
+      bits = 1 << np.arange(self.grid_width)
+      self.row_masks = [int(row_mask) for row_mask in occupied.dot(bits)]
+      self._row_fills = [int(row_fill) for row_fill in occupied.sum(axis=1)]
+
+   # Method that recomputes the occupancy bitmasks of the columns from the tile 
+   # matrix
+   def update_column_masks(self):
+      occupied = self.tile_matrix != 0
+      bits = 1 << np.arange(self.grid_height)
+      self.column_masks = [int(column_mask) for column_mask in bits.dot(occupied)]
+      self._column_heights = [mask.bit_length() for mask in self.column_masks]
+
+   # Method that returns the row on which a tile falling down from the given 
+   # row in the given column lands, i.e. the row above the highest locked tile
+   # below the given row (0 when there is no such tile)
+   def get_landing_row(self, col, row):
+      return (self.column_masks[col] & ((1 << row) - 1)).bit_length()
 
    # Method used for checking whether the grid cell with given row and column 
    # indexes is occupied by a tile or empty
@@ -162,9 +309,17 @@ class GameGrid:
       # tiles with position.y >= grid_height
       if not self.is_inside(row, col):
          return False
-      # the cell is occupied by a tile if it is not None
-      return self.tile_matrix[row][col] is not None
+      # the cell is occupied by a tile if its bit is set in the row bitmask
+      return (self.row_masks[row] >> col) & 1 == 1
       
+   # Method that returns the tile at the given row and column indexes as a Tile 
+   # object (used for drawing the tile) or None when the cell is empty
+   def get_tile(self, row, col):
+      exponent = self.tile_matrix[row][col]
+      if exponent == 0:
+         return None
+      return Tile(int(Tile.numbers[exponent]))
+
    # Method used for checking whether the cell with given row and column indexes 
    # is inside the game grid or not
    def is_inside(self, row, col):
@@ -177,98 +332,53 @@ class GameGrid:
    # Method that locks the tiles of the landed tetromino on the game grid while
    # checking if the game is over due to having tiles above the topmost grid row.
    # The method returns True when the game is over and False otherwise.
-   def update_grid(self, tiles_to_lock, blc_position):
+   def update_grid(self, cells_to_lock):
       # necessary for the display method to stop displaying the tetromino
       self.current_tetromino = None
-      # lock the tiles of the current tetromino (tiles_to_lock) on the game grid 
-      n_rows, n_cols = len(tiles_to_lock), len(tiles_to_lock[0])
-      for col in range(n_cols):
-         for row in range(n_rows):            
-            # place each tile onto the game grid
-            if tiles_to_lock[row][col] is not None:
-               # compute the position of the tile on the game grid
-               pos = Point()
-               pos.x = blc_position.x + col
-               pos.y = blc_position.y + (n_rows - 1) - row
-               if self.is_inside(pos.y, pos.x):
-                  self.tile_matrix[pos.y][pos.x] = tiles_to_lock[row][col]
-               # the game is over if any placed tile is above the game grid
-               else:
-                  self.game_over = True
+      # lock the tiles of the current tetromino (cells_to_lock as a list of 
+      # (x, y, exponent) tuples) on the game grid 
+      for x, y, exponent in cells_to_lock:
+         # place each tile onto the game grid
+         if self.is_inside(y, x):
+            # (a tile may be placed on an occupied cell when the game is over)
+            if not self.is_occupied(y, x):
+               self._row_fills[y] += 1
+            self.tile_matrix[y][x] = exponent
+            self.max_tile = max(self.max_tile, int(Tile.numbers[exponent]))
+            self.row_masks[y] |= 1 << x
+            self.column_masks[x] |= 1 << y
+            self._column_heights[x] = max(self._column_heights[x], y + 1)
+            self.changed_columns.add(x)
+         # the game is over if any placed tile is above the game grid
+         else:
+            self.game_over = True
       # return the game_over flag
       return self.game_over
 
-   # clearing lines of the game grid
+   # clearing lines of the game grid: all the full rows are found by using the
+   # row fill counts and removed in a single pass where the remaining rows are 
+   # moved down in place and the rows at the top are emptied
    def clear_tiles(self):
-      row = 0
-      while(row < self.grid_height):
-         # check if the row is full
-         if all(self.tile_matrix[row]):
-            for element in self.tile_matrix[row]:
-               self.score += element.number
-            # remove the row from the game grid
-            self.tile_matrix = np.delete(self.tile_matrix, row, 0)
-            # add an empty row to the game grid
-            self.tile_matrix = np.insert(self.tile_matrix, -1, None, 0)
-         else:
-            row += 1
-
-   # draws the ghost tetromino on the game grid
-   def ghost_tetromino(self):
-      # the ghost tetromino is the same as the current tetromino, but with a 
-      # different color
-      ghost_tetromino = cp.deepcopy(self.current_tetromino)
-      while ghost_tetromino.can_be_moved("down", self):
-         ghost_tetromino.move("down", self)
-      ghost_tetromino.draw(True)
-                        
-   # Method that displays the pause screen
-   def pause_game_screen(self):
-      # colors used for the menu
-      background_color = Color(42, 69, 99)
-      button_color = Color(25, 255, 228)
-      text_color = Color(31, 160, 239)
-      # clear the background canvas to background_color
-      stddraw.clear(background_color)
-      # get the directory in which this python code file is placed
-      current_dir = os.path.dirname(os.path.realpath(__file__))
-      # path of the image file
-      img_file = current_dir + "/images/menu_image.png"
-      # center coordinates to display the image
-      img_center_x, img_center_y = (self.game_width - 1) / 2, self.grid_height - 5
-      # image is represented using the Picture class
-      image_to_display = Picture(img_file)
-      # display the image
-      stddraw.picture(image_to_display, img_center_x, img_center_y)
-      # dimensions of the start game button
-      button_w, button_h = 5, 1.5
-      # coordinates of the bottom left corner of the start game button 
-      button_blc_x, button_blc_y = img_center_x - button_w / 2, self.grid_height - 12
-      # display the continue button as a filled rectangle
-      stddraw.setPenColor(button_color)
-      stddraw.filledRectangle(button_blc_x, button_blc_y, button_w, button_h)
-      # display the text on the continue button
-      stddraw.setFontFamily("Arial")
-      stddraw.setFontSize(25)
-      stddraw.setPenColor(text_color)
-      text_to_display = "Continue"
-      stddraw.text(img_center_x, button_blc_y + 0.75, text_to_display)
-      
-      # pause screen iteration
-      while True:
-         # display the menu and wait for a short time (50 ms)
-         stddraw.show(50)
-         if stddraw.hasNextKeyTyped():
-            key_typed = stddraw.nextKeyTyped()
-            if key_typed == "p":
-               break
-         # check if the mouse has been left-clicked on the button
-         if stddraw.mousePressed():
-            # get the x and y coordinates of the location at which the mouse has 
-            # most recently been left-clicked  
-            mouse_x, mouse_y = stddraw.mouseX(), stddraw.mouseY()
-            # check if these coordinates are inside the button
-            if mouse_x >= button_blc_x and mouse_x <= button_blc_x + button_w:
-               if mouse_y >= button_blc_y and mouse_y <= button_blc_y + button_h:
-                  # return to the game
-                  break
\ No newline at end of file
+      full_rows = [row for row in range(self.grid_height)
+                   if self._row_fills[row] == self.grid_width]
+      if len(full_rows) == 0:
+         return
+      self.lines_cleared += len(full_rows)
+      # the numbers on the tiles in the full rows are added to the score
+      self.score += int(Tile.numbers[self.tile_matrix[full_rows]].sum())
+      # move each remaining row above the lowest full row down to the next
+      # free row (each row is copied at most once)
+      free_row = full_rows[0]
+      for row in range(full_rows[0] + 1, self.grid_height):
+         if self._row_fills[row] != self.grid_width:
+            self.tile_matrix[free_row] = self.tile_matrix[row]
+            self.row_masks[free_row] = self.row_masks[row]
+            self._row_fills[free_row] = self._row_fills[row]
+            free_row += 1
+      # add empty rows to the top of the game grid
+      self.tile_matrix[free_row:] = 0
+      self.row_masks[free_row:] = [0] * (self.grid_height - free_row)
+      self._row_fills[free_row:] = [0] * (self.grid_height - free_row)
+      self.update_column_masks()
+      # all the columns are changed when a row is removed
+      self.changed_columns.update(range(self.grid_width))
\ No newline at end of file
@@ -0,0 +1,421 @@
+import os
+import lib.stddraw as stddraw  # stddraw is used as a basic graphics library
+import numpy as np  # fundamental Python module for scientific computing
+from lib.picture import Picture  # used for displaying images
+from lib.color import Color # used for coloring the game grid
+from point import Point  # used for tile positions
+from utils import get_next_display_dict
+
+# Class used for displaying a game grid (see GameGrid) by using stddraw
+class GameRenderer:
+   # Class attributes shared among all GameRenderer objects
+   # ---------------------------------------------------------------------------
+   # the value of the boundary thickness (for the boxes around the tiles)
+   tile_boundary_thickness = 0.004
+   # font family and size used for displaying the tile numbers
+   tile_font_family, tile_font_size = "Arial", 14
+   # fonts used by the renderer as (family, size, bold) that are loaded when 
+   # the renderer is created
+   fonts = [(tile_font_family, tile_font_size, False), ("Arial", 15, True),
+            ("Arial", 20, True), ("Arial", 25, True), ("Arial", 25, False)]
+
+   # Constructor for creating the renderer of the given game grid
+   def __init__(self, game_grid):
+      # set the game grid to display
+      self.game_grid = game_grid
+      # set the color used for the empty grid cells
+      self.empty_cell_color = Color(206, 195, 181)
+      # set the colors used for the grid lines and the grid boundaries
+      self.line_color = Color(185, 171, 158)
+      self.boundary_color = Color(132, 122, 113)
+      # thickness values used for the grid lines and the boundaries
+      self.line_thickness = 0.005
+      self.box_thickness = 2.5 * self.line_thickness
+      self.info_line_thickness = 3 * self.line_thickness
+      # the state of the game grid in the last displayed frame that is used 
+      # for redrawing only the changed cells (the whole canvas is redrawn when
+      # needs_full_redraw is set)
+      self.needs_full_redraw = True
+      self.drawn_tile_matrix = None
+      self.drawn_tetromino_cells, self.drawn_ghost_cells = {}, {}
+      self.drawn_info = None
+      # the cells of the ghost tetromino and the (tetromino, position, rotation)
+      # they are computed for (the locked tiles only change when a new 
+      # tetromino is spawned)
+      self.ghost_cells, self.ghost_key = {}, None
+      # the cells of the next tetromino preview and the next tetromino they are
+      # computed for
+      self.next_cells, self.next_key = [], None
+      # the pictures of the tiles drawn once for each (number, is_ghost, 
+      # length) and then drawn as pictures (created again with the background)
+      self.tile_sprites = {}
+      # load the fonts used for drawing the texts
+      stddraw.loadFonts(GameRenderer.fonts)
+      # the static parts of the drawing (the empty cells, the grid lines and the
+      # info panel without the scores and the next tetromino) are drawn once as
+      # a background picture and drawn again only when the grid is resized
+      self.background, self.background_size = None, None
+      self.create_background()
+
+   # Method used for displaying the game grid where only the cells and the 
+   # info panel changed since the last displayed frame are redrawn and updated 
+   # on the window
+   def display(self):
+      grid = self.game_grid
+      tetromino_cells = self.get_tetromino_cells()
+      ghost_cells = self.get_ghost_cells()
+      info = (grid.score, grid.best_score, grid.next_tetromino)
+      if self.needs_full_redraw:
+         self.display_all()
+      else:
+         rects = []
+         # find the cells changed since the last frame (locked, merged or 
+         # cleared tiles and the cells of the moved tetromino and ghost)
+         changed = np.argwhere(grid.tile_matrix != self.drawn_tile_matrix)
+         dirty_cells = {(int(col), int(row)) for row, col in changed}
+         for drawn, cells in ((self.drawn_tetromino_cells, tetromino_cells),
+                              (self.drawn_ghost_cells, ghost_cells)):
+            for cell in set(drawn) | set(cells):
+               drawn_tile, tile = drawn.get(cell), cells.get(cell)
+               if drawn_tile is None or tile is None or drawn_tile.number != tile.number:
+                  dirty_cells.add(cell)
+         # redraw the changed cells
+         for col, row in dirty_cells:
+            self.draw_cell(col, row, tetromino_cells, ghost_cells)
+            rects.append((col - 0.5, row - 0.5, 1, 1))
+         # redraw the info panel when the score or the next tetromino changes
+         if info[0] != self.drawn_info[0] or info[1] != self.drawn_info[1] \
+            or info[2] is not self.drawn_info[2]:
+            self.draw_info()
+            rects.append((grid.grid_width - 0.5, -0.5, grid.info_width, grid.grid_height))
+         # draw the boxes around the game grid and the info panel again as 
+         # they may be covered by the redrawn cells
+         if len(rects) > 0:
+            self.draw_boundaries()
+         # show the changed areas (the timing is done by the game loop)
+         stddraw.showRectangles(rects)
+      # keep the displayed state to find the changes in the next frame
+      self.drawn_tile_matrix = grid.tile_matrix.copy()
+      self.drawn_tetromino_cells, self.drawn_ghost_cells = tetromino_cells, ghost_cells
+      self.drawn_info = info
+
+   # Method used for redrawing the whole game grid
+   def display_all(self):
+      grid = self.game_grid
+      # create the background picture again if the game grid is resized
+      if self.background_size != (grid.grid_height, grid.grid_width, grid.info_width):
+         self.create_background()
+      # draw the background picture
+      stddraw.picture(self.background)
+      # draw the tiles on the game grid
+      self.draw_grid()
+      # draw the current/active tetromino if it is not None (the case when the 
+      # game grid is updated)
+      if grid.current_tetromino is not None:
+         self.draw_tetromino(grid.current_tetromino)
+         # ghost tetromino for help the user in game modes easy and medium
+         if grid.game_type != "hard":
+            self.draw_ghost_tetromino()
+      # draw the score and the next tetromino
+      self.draw_info()
+      # draw a box around the game grid 
+      self.draw_boundaries()
+      # show the resulting drawing (the timing is done by the game loop)
+      stddraw.show(0)
+      self.needs_full_redraw = False
+
+   # Method for drawing the static parts of the drawing on the canvas and 
+   # keeping them as the background picture
+   def create_background(self):
+      grid = self.game_grid
+      # clear the background to empty_cell_color
+      stddraw.clear(self.empty_cell_color)
+      # draw the inner lines of the grid
+      stddraw.setPenColor(self.line_color)
+      stddraw.setPenRadius(self.line_thickness)
+      # x and y ranges for the game grid
+      start_x, end_x = -0.5, grid.grid_width - 0.5
+      start_y, end_y = -0.5, grid.grid_height - 0.5
+      for x in np.arange(start_x + 1, end_x, 1):  # vertical inner lines
+         stddraw.line(x, start_y, x, end_y)
+      for y in np.arange(start_y + 1, end_y, 1):  # horizontal inner lines
+         stddraw.line(start_x, y, end_x, y)
+      stddraw.setPenRadius()  # reset the pen radius to its default value
+      # info grid settings
+      stddraw.setPenColor(Color(167, 160, 151))
+      stddraw.filledRectangle(grid.grid_width - 0.5, -0.5, grid.info_width, grid.grid_height)
+      info_center_x_scale = (grid.grid_width + grid.info_width / 2) - 0.5
+      info_score_y_scale = (grid.grid_height - 2)
+      # draw the labels of the score, the best score and the next tetromino
+      stddraw.setPenColor(Color(255, 255, 255))
+      stddraw.setFontFamily("Arial")
+      stddraw.setFontSize(25)
+      stddraw.boldText(info_center_x_scale, info_score_y_scale, "Score")
+      stddraw.setFontSize(15)
+      stddraw.boldText(info_center_x_scale, info_score_y_scale - 2, "Best Score")
+      stddraw.boldText(info_center_x_scale, 5, "Next")
+      # Stop Game button
+      stddraw.setPenColor(self.boundary_color)
+      stddraw.filledRectangle(grid.grid_width + 0.5, grid.grid_height / 2 + 1, grid.info_width - 2, 1)
+      stddraw.setPenColor(Color(255, 255, 255))
+      stddraw.setFontFamily("Arial")
+      stddraw.setFontSize(20)
+      stddraw.boldText(grid.grid_width + 2, grid.grid_height / 2 + 1.5, "Stop")
+      # Pause Game button
+      stddraw.setPenColor(self.boundary_color)
+      stddraw.filledRectangle(grid.grid_width + 0.5, grid.grid_height / 2 - 0.25, grid.info_width - 2, 1)
+      stddraw.setPenColor(Color(255, 255, 255))
+      stddraw.setFontFamily("Arial")
+      stddraw.setFontSize(20)
+      stddraw.boldText(grid.grid_width + 2, grid.grid_height / 2 + 0.25, "Pause")
+      # keep the drawing as the background picture
+      self.background = stddraw.snapshot()
+      self.background_size = (grid.grid_height, grid.grid_width, grid.info_width)
+      # the tile pictures are created again as the canvas may be resized
+      self.tile_sprites = {}
+
+   # Method for redrawing a single cell of the game grid where the tiles of 
+   # the neighbouring cells are also drawn (restricted to the area of the cell) 
+   # in the same order as display_all as the tile boundaries overlap the 
+   # adjacent cells
+   def draw_cell(self, col, row, tetromino_cells, ghost_cells):
+      grid = self.game_grid
+      stddraw.setClip(col - 0.5, row - 0.5, 1, 1)
+      # draw the background of the cell
+      stddraw.picture(self.background)
+      neighbours = [(x, y) for y in range(row - 1, row + 2)
+                    for x in range(col - 1, col + 2) if grid.is_inside(y, x)]
+      # draw the tiles locked on the cell and the neighbouring cells
+      for x, y in neighbours:
+         if grid.tile_matrix[y][x] != 0:
+            self.draw_tile(grid.get_tile(y, x), Point(x, y))
+      # draw the tiles of the current tetromino and the ghost tetromino on the
+      # cell and the neighbouring cells
+      for x, y in neighbours:
+         if (x, y) in tetromino_cells:
+            self.draw_tile(tetromino_cells[(x, y)], Point(x, y))
+      for x, y in neighbours:
+         if (x, y) in ghost_cells:
+            self.draw_tile(ghost_cells[(x, y)], Point(x, y), is_ghost=True)
+      stddraw.setClip()  # remove the restriction on the drawing area
+
+   # Method that returns the tiles of the current tetromino inside the game grid
+   # as a dictionary from (col, row) positions to tiles
+   def get_tetromino_cells(self):
+      tetromino = self.game_grid.current_tetromino
+      if tetromino is None:
+         return {}
+      return {(x, y): tile for x, y, tile in tetromino.get_cells()
+              if y < self.game_grid.grid_height}
+
+   # Method that returns the tiles of the ghost tetromino (drawn for the game 
+   # modes easy and medium) as a dictionary from (col, row) positions to tiles
+   def get_ghost_cells(self):
+      grid = self.game_grid
+      tetromino = grid.current_tetromino
+      if tetromino is None or grid.game_type == "hard":
+         return {}
+      key = (tetromino, tetromino.bottom_left_cell.x, tetromino.bottom_left_cell.y,
+             tetromino.rotation)
+      if key != self.ghost_key:
+         # the ghost tetromino has the tiles of the current tetromino moved 
+         # down to the position where the current tetromino lands
+         distance = tetromino.get_drop_distance(grid)
+         self.ghost_cells = {(x, y - distance): tile
+                             for x, y, tile in tetromino.get_cells()
+                             if y - distance < grid.grid_height}
+         self.ghost_key = key
+      return self.ghost_cells
+
+   # Method for drawing the tiles locked on the game grid
+   def draw_grid(self):
+      grid = self.game_grid
+      # for each cell of the game grid
+      for row in range(grid.grid_height):
+         for col in range(grid.grid_width):
+            # draw the tile if the grid cell is occupied by a tile
+            if grid.tile_matrix[row][col] != 0:
+               self.draw_tile(grid.get_tile(row, col), Point(col, row))
+
+   # Method for drawing the boundaries around the game grid
+   def draw_boundaries(self):
+      grid = self.game_grid
+      # draw a bounding box around the game grid as a rectangle
+      stddraw.setPenColor(self.boundary_color)  # using boundary_color
+      # set the pen radius as box_thickness (half of this thickness is visible
+      # for the bounding box as its lines lie on the boundaries of the canvas)
+      stddraw.setPenRadius(self.box_thickness)
+      # the coordinates of the bottom left corner of the game grid
+      pos_x, pos_y = -0.5, -0.5
+      stddraw.rectangle(pos_x, pos_y, grid.grid_width, grid.grid_height)
+      # set pen radius for info box boundaries
+      stddraw.setPenRadius(self.info_line_thickness)
+      stddraw.rectangle(grid.grid_width - 0.5, pos_y, grid.info_width, grid.grid_height)
+      stddraw.setPenRadius()  # reset the pen radius to its default value
+
+   # Method for drawing the score and the next tetromino
+   def draw_info(self):
+      grid = self.game_grid
+      # draw the background of the info panel (with the labels and the buttons)
+      stddraw.setClip(grid.grid_width - 0.5, -0.5, grid.info_width, grid.grid_height)
+      stddraw.picture(self.background)
+      stddraw.setClip()
+      info_center_x_scale = (grid.grid_width + grid.info_width / 2) - 0.5
+      info_score_y_scale = (grid.grid_height - 2)
+      # draw the score
+      stddraw.setPenColor(Color(255, 255, 255))
+      stddraw.setFontFamily("Arial")
+      stddraw.setFontSize(25)
+      stddraw.boldText(info_center_x_scale, info_score_y_scale - 0.75, str(grid.score))
+      # draw the best score
+      stddraw.setFontSize(15)
+      stddraw.boldText(info_center_x_scale, info_score_y_scale - 2.50, str(grid.best_score))
+      # draw the next tetromino
+      for x, y, tile in self.get_next_cells():
+         self.draw_tile(tile, Point(x, y))
+
+   # Method that returns the tiles of the next tetromino placed on the info 
+   # panel as a list of (x, y, tile) tuples (computed once for each tetromino)
+   def get_next_cells(self):
+      grid = self.game_grid
+      if grid.next_tetromino is not self.next_key:
+         self.next_cells, self.next_key = [], grid.next_tetromino
+         if grid.next_tetromino is not None:
+            position = get_next_display_dict(grid.grid_width)[grid.next_tetromino.type]
+            self.next_cells = grid.next_tetromino.get_cells(position['x'], position['y'])
+      return self.next_cells
+
+   # Method that checks whether the stop or the pause button is clicked and
+   # returns "stop", "pause" or None accordingly
+   def check_buttons(self):
+      grid = self.game_grid
+      if stddraw.mousePressed():
+         # get the x and y coordinates of the location at which the mouse has
+         # most recently been left-clicked
+         mouse_x, mouse_y = stddraw.mouseX(), stddraw.mouseY()
+         # check if these coordinates are inside the stop button
+         if mouse_x >= grid.grid_width + 0.5 and mouse_x <= grid.grid_width + grid.info_width - 1.5:
+            if mouse_y >= grid.grid_height / 2 + 1 and mouse_y <= grid.grid_height / 2 + 2:
+               return "stop"
+         # check if these coordinates are inside the pause button
+         if mouse_x >= grid.grid_width + 0.5 and mouse_x <= grid.grid_width + grid.info_width - 1.5:
+            if mouse_y >= grid.grid_height / 2 - 0.25 and mouse_y <= grid.grid_height / 2 + 0.75:
+               return "pause"
+      return None
+
+   # Method for drawing a tetromino on the game grid
+   def draw_tetromino(self, tetromino, is_ghost = False):
+      for x, y, tile in tetromino.get_cells():
+         # draw only the tiles that are inside the game grid
+         if y < self.game_grid.grid_height:
+            self.draw_tile(tile, Point(x, y), is_ghost=is_ghost)
+
+   # Method for drawing the ghost tetromino on the game grid
+   def draw_ghost_tetromino(self):
+      # the ghost tetromino has the tiles of the current tetromino drawn with a
+      # different color at the position where the current tetromino lands
+      for (x, y), tile in self.get_ghost_cells().items():
+         self.draw_tile(tile, Point(x, y), is_ghost=True)
+
+   # Method for drawing a tile at the given position by using its picture 
+   # that is created when the tile is drawn for the first time
+   def draw_tile(self, tile, position, length = 1, is_ghost = False):
+      key = (tile.number, is_ghost, length)
+      sprite = self.tile_sprites.get(key)
+      if sprite is None:
+         sprite = self.create_tile_sprite(tile, length, is_ghost)
+         self.tile_sprites[key] = sprite
+      stddraw.picture(sprite, position.x, position.y)
+
+   # Method that draws the given tile on a transparent canvas and returns it 
+   # as a picture
+   def create_tile_sprite(self, tile, length, is_ghost):
+      # the tile is drawn on the center of the game grid
+      position = Point(self.game_grid.grid_width // 2, self.game_grid.grid_height // 2)
+      stddraw.beginPicture()
+      self.render_tile(tile, position, length, is_ghost)
+      return stddraw.endPicture(position.x - length / 2, position.y - length / 2,
+                                length, length)
+
+   # Method for drawing a tile at the given position with the drawing functions
+   def render_tile(self, tile, position, length = 1, is_ghost = False):
+      # draw the ghost tile
+      if is_ghost:
+         stddraw.setPenColor(Color(167, 160, 151))
+         stddraw.filledSquare(position.x, position.y, length / 2)
+         stddraw.setPenColor(tile.background_color)
+         stddraw.setPenRadius(GameRenderer.tile_boundary_thickness)
+         stddraw.square(position.x, position.y, length / 2)
+         stddraw.setPenRadius()  # reset the pen radius to its default value
+         # draw the number on the tile
+         stddraw.setPenColor(Color(255, 255, 255))
+         stddraw.setFontFamily(GameRenderer.tile_font_family)
+         stddraw.setFontSize(GameRenderer.tile_font_size)
+         stddraw.text(position.x, position.y, str(tile.number))
+      # draw the tile
+      else:
+         stddraw.setPenColor(tile.background_color)
+         stddraw.filledSquare(position.x, position.y, length / 2)
+         stddraw.setPenColor(tile.box_color)
+         stddraw.setPenRadius(GameRenderer.tile_boundary_thickness)
+         stddraw.square(position.x, position.y, length / 2)
+         stddraw.setPenRadius()  # reset the pen radius to its default value
+         # draw the number on the tile
+         stddraw.setPenColor(tile.foreground_color)
+         stddraw.setFontFamily(GameRenderer.tile_font_family)
+         stddraw.setFontSize(GameRenderer.tile_font_size)
+         stddraw.text(position.x, position.y, str(tile.number))
+
+   # Method that displays the pause screen
+   def pause_game_screen(self):
+      grid = self.game_grid
+      # colors used for the menu
+      background_color = Color(42, 69, 99)
+      button_color = Color(25, 255, 228)
+      text_color = Color(31, 160, 239)
+      # clear the background canvas to background_color
+      stddraw.clear(background_color)
+      # get the directory in which this python code file is placed
+      current_dir = os.path.dirname(os.path.realpath(__file__))
+      # path of the image file
+      img_file = current_dir + "/images/menu_image.png"
+      # center coordinates to display the image
+      img_center_x, img_center_y = (grid.game_width - 1) / 2, grid.grid_height - 5
+      # image is represented using the Picture class
+      image_to_display = Picture(img_file)
+      # display the image
+      stddraw.picture(image_to_display, img_center_x, img_center_y)
+      # dimensions of the start game button
+      button_w, button_h = 5, 1.5
+      # coordinates of the bottom left corner of the start game button
+      button_blc_x, button_blc_y = img_center_x - button_w / 2, grid.grid_height - 12
+      # display the continue button as a filled rectangle
+      stddraw.setPenColor(button_color)
+      stddraw.filledRectangle(button_blc_x, button_blc_y, button_w, button_h)
+      # display the text on the continue button
+      stddraw.setFontFamily("Arial")
+      stddraw.setFontSize(25)
+      stddraw.setPenColor(text_color)
+      text_to_display = "Continue"
+      stddraw.text(img_center_x, button_blc_y + 0.75, text_to_display)
+
+      # pause screen iteration
+      while True:
+         # display the menu and wait for a short time (50 ms)
+         stddraw.show(50)
+         if stddraw.hasNextKeyTyped():
+            key_typed = stddraw.nextKeyTyped()
+            if key_typed == "p":
+               break
+         # check if the mouse has been left-clicked on the button
+         if stddraw.mousePressed():
+            # get the x and y coordinates of the location at which the mouse has
+            # most recently been left-clicked
+            mouse_x, mouse_y = stddraw.mouseX(), stddraw.mouseY()
+            # check if these coordinates are inside the button
+            if mouse_x >= button_blc_x and mouse_x <= button_blc_x + button_w:
+               if mouse_y >= button_blc_y and mouse_y <= button_blc_y + button_h:
+                  # return to the game
+                  break
+      # the whole game grid is redrawn after the pause screen
+      self.needs_full_redraw = True
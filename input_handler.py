@@ -0,0 +1,49 @@
+import time  # the monotonic clock is used for the key repeat timing
+import lib.stddraw as stddraw  # stddraw is used for getting the typed keys
+
+# Class used for reading the keys typed by the user where the held keys given 
+# as repeat_keys (e.g. the arrow keys) are repeated: a held key is repeated 
+# after das_ms milliseconds (delayed auto shift) and then every arr_ms 
+# milliseconds (auto repeat rate)
+class InputHandler:
+   # Constructor for creating an input handler with the given repeat settings
+   def __init__(self, repeat_keys = ("left", "right", "down"), das_ms = 170,
+                arr_ms = 50, max_repeats = 10):
+      self.repeat_keys = set(repeat_keys)
+      self.das = das_ms / 1000
+      self.arr = arr_ms / 1000
+      # the max number of times a held key is repeated in a call of get_keys
+      self.max_repeats = max_repeats
+      # the times when the held keys are repeated next
+      self.next_repeat_times = {}
+
+   # Method that forgets the typed and the held keys (e.g. after the game is
+   # paused)
+   def reset(self):
+      stddraw.clearKeysTyped()
+      self.next_repeat_times = {}
+
+   # Method that returns all the keys typed since the last call in the order 
+   # they are typed together with the repeats of the held keys
+   def get_keys(self):
+      keys = []
+      # the typed keys are taken from the queue of stddraw
+      while stddraw.hasNextKeyTyped():
+         key, key_time = stddraw.nextKeyTypedWithTime()
+         keys.append(key)
+         if key in self.repeat_keys:
+            self.next_repeat_times[key] = key_time + self.das
+      # the held keys are repeated
+      now = time.monotonic()
+      for key in list(self.next_repeat_times):
+         # the key is not repeated anymore when it is released
+         if not stddraw.isKeyPressed(key):
+            del self.next_repeat_times[key]
+            continue
+         next_time = self.next_repeat_times[key]
+         if now < next_time:
+            continue
+         n_repeats = int((now - next_time) // self.arr) + 1
+         keys.extend([key] * min(n_repeats, self.max_repeats))
+         self.next_repeat_times[key] = next_time + n_repeats * self.arr
+      return keys
@@ -9,9 +9,12 @@ objects.
 
 class Color:
     """
-    A Color object models an RGB color.
+    A Color object models an RGB color.  Color objects are not
+    changed after they are constructed, so they can be shared.
     """
 
+    __slots__ = ('_r', '_g', '_b')
+
     #-------------------------------------------------------------------
 
     def __init__(self, r=0, g=0, b=0):
@@ -10,6 +10,7 @@ commonly used Color objects defined in the color module.
 import time
 import os
 import sys
+import collections
 
 os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = 'hide'
 import pygame
@@ -45,6 +46,8 @@ from lib.color import BOOK_BLUE
 from lib.color import BOOK_LIGHT_BLUE
 from lib.color import BOOK_RED
 
+from lib.picture import Picture
+
 #-----------------------------------------------------------------------
 
 # Default Sizes and Values
@@ -61,6 +64,8 @@ _DEFAULT_PEN_COLOR = BLACK
 
 _DEFAULT_FONT_FAMILY = 'Helvetica'
 _DEFAULT_FONT_SIZE = 12
+_FONT_CACHE_SIZE = 32
+_TEXT_CACHE_SIZE = 256
 
 _xmin = None
 _ymin = None
@@ -69,12 +74,16 @@ _ymax = None
 
 _fontFamily = _DEFAULT_FONT_FAMILY
 _fontSize = _DEFAULT_FONT_SIZE
+_fonts = collections.OrderedDict()  # (family, size, bold) -> pygame font
+_texts = collections.OrderedDict()  # (s, family, size, color, bold) -> surface
+_savedSurface = None
 
 _canvasWidth = float(_DEFAULT_CANVAS_SIZE)
 _canvasHeight = float(_DEFAULT_CANVAS_SIZE)
 _penRadius = None
 _penColor = _DEFAULT_PEN_COLOR
-_keysTyped = []
+_keysTyped = collections.deque()  # (key, time) of the typed keys
+_keysPressed = set()  # the keys that are held down
 
 # Has the window been created?
 _windowCreated = False
@@ -230,6 +239,54 @@ def setFontSize(s=_DEFAULT_FONT_SIZE):
     global _fontSize
     _fontSize = s
 
+def loadFonts(fonts):
+    """
+    Load the given fonts into the font cache so that the first text
+    drawn with them is not slowed down by the font lookup.  fonts is
+    a sequence of (family, size) or (family, size, bold) tuples.
+    """
+    for f in fonts:
+        _getFont(*f)
+
+def _getFont(family=None, size=None, bold=False):
+    """
+    Return the pygame font with the given family, size and weight
+    (the current font family and size by default).  The fonts are
+    cached, and the least recently used one is removed when the
+    cache has more than _FONT_CACHE_SIZE fonts.
+    """
+    if family is None:
+        family = _fontFamily
+    if size is None:
+        size = _fontSize
+    key = (family, size, bool(bold))
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(family, size, bold)
+        _fonts[key] = font
+        if len(_fonts) > _FONT_CACHE_SIZE:
+            _fonts.popitem(last=False)
+    else:
+        _fonts.move_to_end(key)
+    return font
+
+def setClip(x=None, y=None, w=None, h=None):
+    """
+    Restrict the drawing to the rectangle of width w and height h
+    whose lower left point is (x, y), so that the drawing functions
+    do not change the background canvas outside of the rectangle.
+    Call setClip() without arguments to remove the restriction.
+    """
+    _makeSureWindowCreated()
+    if x is None:
+        _surface.set_clip(None)
+        return
+    xs = _scaleX(x)
+    ys = _scaleY(y + h)
+    _surface.set_clip(pygame.Rect(int(round(xs)), int(round(ys)),
+        int(round(xs + _factorX(w))) - int(round(xs)),
+        int(round(ys + _factorY(h))) - int(round(ys))))
+
 #-----------------------------------------------------------------------
 
 def _makeSureWindowCreated():
@@ -469,8 +526,7 @@ def text(x, y, s):
     y = float(y)
     xs = _scaleX(x)
     ys = _scaleY(y)
-    font = pygame.font.SysFont(_fontFamily, _fontSize)
-    text = font.render(s, 1, _pygameColor(_penColor))
+    text = _renderText(s)
     textpos = text.get_rect(center=(xs, ys))
     _surface.blit(text, textpos)
 
@@ -483,11 +539,31 @@ def boldText(x, y, s):
     y = float(y)
     xs = _scaleX(x)
     ys = _scaleY(y)
-    font = pygame.font.SysFont(_fontFamily, _fontSize, True)
-    text = font.render(s, 1, _pygameColor(_penColor))
+    text = _renderText(s, True)
     textpos = text.get_rect(center=(xs, ys))
     _surface.blit(text, textpos)
 
+def _renderText(s, bold=False):
+    """
+    Return the surface of string s rendered with the current font
+    family, font size and pen color.  The surfaces are cached, and
+    the least recently used one is removed when the cache has more
+    than _TEXT_CACHE_SIZE surfaces.
+    """
+    c = _penColor
+    key = (s, _fontFamily, _fontSize,
+        (c.getRed(), c.getGreen(), c.getBlue()), bool(bold))
+    text = _texts.get(key)
+    if text is None:
+        font = _getFont(bold=bold)
+        text = font.render(s, 1, _pygameColor(c))
+        _texts[key] = text
+        if len(_texts) > _TEXT_CACHE_SIZE:
+            _texts.popitem(last=False)
+    else:
+        _texts.move_to_end(key)
+    return text
+
 def picture(pic, x=None, y=None):
     """
     Draw pic on the background canvas centered at (x, y).  pic is an
@@ -510,6 +586,49 @@ def picture(pic, x=None, y=None):
     picSurface = pic._surface # violates encapsulation
     _surface.blit(picSurface, [xs-ws/2.0, ys-hs/2.0, ws, hs])
 
+def snapshot():
+    """
+    Return a picture.Picture object that is a copy of the background
+    canvas.  The picture can be drawn later with picture(pic) to
+    restore the drawing, e.g. for drawing the static parts of a
+    scene once.
+    """
+    _makeSureWindowCreated()
+    pic = Picture(_canvasWidth, _canvasHeight)
+    pic._surface = _surface.copy() # violates encapsulation
+    return pic
+
+def beginPicture():
+    """
+    Draw on a new transparent canvas instead of the background
+    canvas until endPicture() is called.  This is used for drawing
+    a shape once and then drawing it as a picture many times.
+    """
+    global _surface
+    global _savedSurface
+    _makeSureWindowCreated()
+    _savedSurface = _surface
+    _surface = pygame.Surface(_savedSurface.get_size(), pygame.SRCALPHA)
+
+def endPicture(x, y, w, h):
+    """
+    Return a picture.Picture object that contains the drawing on
+    the transparent canvas (see beginPicture()) in the rectangle of
+    width w and height h whose lower left point is (x, y), enlarged
+    by the pen radius so that lines drawn on its edges are included,
+    and draw on the background canvas again.  The picture is drawn
+    at the same place when picture(pic, x + w/2, y + h/2) is called.
+    """
+    global _surface
+    margin = int(_penRadius) + 2
+    r = pygame.Rect(int(_scaleX(x)) - margin, int(_scaleY(y + h)) - margin,
+        int(_factorX(w)) + 2 * margin, int(_factorY(h)) + 2 * margin)
+    pic = Picture(r.width, r.height)
+    pic._surface = pygame.Surface(r.size, pygame.SRCALPHA) # violates encapsulation
+    pic._surface.blit(_surface, (0, 0), r)
+    _surface = _savedSurface
+    return pic
+
 def clear(c=WHITE):
     """
     Clear the background canvas to color c, where c is an
@@ -569,18 +688,54 @@ def show(msec=float('inf')):
     _makeSureWindowCreated()
     _show()
     _checkForEvents()
+    _wait(msec)
+
+def showRectangles(rects, msec=0.0):
+    """
+    Copy the given areas of the background canvas to the window
+    canvas, and then wait for msec milliseconds. Each area is given
+    as a tuple (x, y, w, h) that defines a rectangle of width w and
+    height h whose lower left point is (x, y). Only the given areas
+    of the window are updated, which is faster than show() when a
+    small part of the drawing changes.
+    """
+    _makeSureWindowCreated()
+    pixelRects = [_pixelRectangle(x, y, w, h) for (x, y, w, h) in rects]
+    for r in pixelRects:
+        _background.blit(_surface, r, r)
+    pygame.display.update(pixelRects)
+    _checkForEvents()
+    _wait(msec)
+
+def _pixelRectangle(x, y, w, h):
+    """
+    Return the pygame.Rect of the pixels covered by the rectangle of
+    width w and height h whose lower left point is (x, y), enlarged
+    by the pen radius so that lines drawn on its edges are included.
+    """
+    margin = int(_penRadius) + 2
+    xs = int(_scaleX(x)) - margin
+    ys = int(_scaleY(y + h)) - margin
+    ws = int(_factorX(w)) + 2 * margin + 1
+    hs = int(_factorY(h)) + 2 * margin + 1
+    return pygame.Rect(xs, ys, ws, hs).clip(_surface.get_rect())
 
-    # Sleep for the required time, but check for events every
-    # QUANTUM seconds.
+def _wait(msec):
+    """
+    Wait for msec milliseconds while checking for events.
+    """
+    # Sleep until the required time has passed on the monotonic
+    # clock, but check for events every QUANTUM seconds.
     QUANTUM = .01
     sec = msec / 1000.0
-    if sec < QUANTUM:
-        time.sleep(sec)
+    if sec <= 0:
         return
-    secondsWaited = 0.0
-    while secondsWaited < sec:
-        time.sleep(QUANTUM)
-        secondsWaited += QUANTUM
+    deadline = time.monotonic() + sec
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        time.sleep(min(remaining, QUANTUM))
         _checkForEvents()
 
 #-----------------------------------------------------------------------
@@ -631,7 +786,6 @@ def _checkForEvents():
     pressed).  If a key has been typed, then put that key in a queue.
     """
     global _surface
-    global _keysTyped
     
     #-------------------------------------------------------------------
     # Begin added by Alan J. Broder
@@ -648,7 +802,11 @@ def _checkForEvents():
         if event.type == pygame.QUIT:
             sys.exit()
         elif event.type == pygame.KEYDOWN:
-            _keysTyped = [pygame.key.name(event.key)] + _keysTyped
+            key = pygame.key.name(event.key)
+            _keysTyped.append((key, time.monotonic()))
+            _keysPressed.add(key)
+        elif event.type == pygame.KEYUP:
+            _keysPressed.discard(pygame.key.name(event.key))
         elif (event.type == pygame.MOUSEBUTTONUP) and \
             (event.button == 3):
             _saveToFile()
@@ -675,23 +833,34 @@ def hasNextKeyTyped():
     Return True if the queue of the keys the user typed is not empty.
     Otherwise return False.
     """
-    global _keysTyped
-    return _keysTyped != []
+    return len(_keysTyped) > 0
 
 def nextKeyTyped():
     """
     Remove the first key from the queue of the keys that the user typed,
     and return that key.
     """
-    global _keysTyped
-    return _keysTyped.pop()
+    return _keysTyped.popleft()[0]
+
+def nextKeyTypedWithTime():
+    """
+    Remove the first key from the queue of the keys that the user typed,
+    and return that key and the time it was typed (in seconds on the
+    time.monotonic() clock) as a tuple.
+    """
+    return _keysTyped.popleft()
+
+def isKeyPressed(key):
+    """
+    Return True if the key is held down.  Otherwise return False.
+    """
+    return key in _keysPressed
 
 def clearKeysTyped():
     """
     Clear all the keys in the queue of the keys that the user typed.
     """
-    global _keysTyped
-    _keysTyped = []
+    _keysTyped.clear()
 
 #-----------------------------------------------------------------------
 # Begin added by Alan J. Broder
@@ -0,0 +1,121 @@
+import argparse  # used for parsing the command line arguments
+import json  # used for writing the results of the games
+import os  # used for getting the number of the processors
+import random  # used for the random number generators of the policies
+import time  # used for measuring the simulation time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED  # used for running the games
+from game_grid import GameGrid  # the class for modeling the game grid
+from ai_player import HeuristicPlayer  # the class for the automated player
+
+# The actions that can be applied to the current tetromino
+ACTIONS = ("left", "right", "down", "clockwise", "counterclockwise", "drop")
+
+# Policy that applies a random action at each tick
+def random_policy(rng):
+   return lambda grid: [rng.choice(ACTIONS)]
+
+# Policy that drops each tetromino where it enters the game grid
+def drop_policy(rng):
+   return lambda grid: ["drop"]
+
+# Policy that moves each tetromino to the placement chosen by the heuristic 
+# player and drops it (all the actions are applied at the same tick)
+def heuristic_policy(rng):
+   return HeuristicPlayer().get_actions
+
+# The policies that can be used for playing the games where each policy is a
+# function that takes a random number generator and returns a function that 
+# returns the actions applied to the game grid at a tick
+POLICIES = {"random": random_policy, "drop": drop_policy,
+            "heuristic": heuristic_policy}
+
+# Function that plays the game on the given game grid with the given policy
+# until the game is over or max_pieces tetrominoes are placed and returns the
+# number of the ticks
+def play_game(grid, policy, max_pieces):
+   ticks = 0
+   while not grid.game_over and grid.pieces_placed < max_pieces:
+      for action in policy(grid):
+         grid.apply_action(action)
+         # the tetromino is locked right after the hard drop as in the game
+         if action == "drop":
+            grid.step()
+         if grid.game_over:
+            break
+      # move the tetromino down by one (auto fall)
+      grid.step()
+      ticks += 1
+   return ticks
+
+# Function that plays a headless game with the given settings (given as a tuple
+# so that the games can be run by a process pool) and returns its results
+def run_game(settings):
+   seed, grid_h, grid_w, game_type, policy_name, max_pieces = settings
+   start_time = time.perf_counter()
+   grid = GameGrid(grid_h, grid_w, 5, 0, 0, game_type, seed=seed)
+   policy = POLICIES[policy_name](random.Random(seed))
+   ticks = play_game(grid, policy, max_pieces)
+   return {"seed": seed, "score": grid.score, "lines_cleared": grid.lines_cleared,
+           "max_tile": grid.max_tile, "pieces_placed": grid.pieces_placed,
+           "ticks": ticks, "game_over": grid.game_over,
+           "time": time.perf_counter() - start_time}
+
+# Function that returns the command line arguments of the simulation
+def parse_arguments():
+   parser = argparse.ArgumentParser(description="Simulate headless Tetris 2048 games")
+   parser.add_argument("-n", "--games", type=int, default=100, help="number of games")
+   parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+   parser.add_argument("--height", type=int, default=20, help="grid height (16-24)")
+   parser.add_argument("--width", type=int, default=12, help="grid width (8-20)")
+   parser.add_argument("--game-type", default="easy", choices=("easy", "medium", "hard"))
+   parser.add_argument("--policy", default="random", choices=sorted(POLICIES))
+   parser.add_argument("--max-pieces", type=int, default=10000,
+                       help="max number of tetrominoes placed in a game")
+   parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                       help="number of worker processes")
+   parser.add_argument("-o", "--output", default="simulation_results.jsonl",
+                       help="file to which the result of each game is written")
+   return parser.parse_args()
+
+# Runs the games on a process pool, writes the result of each game to the 
+# output file as a JSON line when it is finished and prints the statistics.
+# At most 4 games per worker are submitted to the pool at a time so that the 
+# memory does not grow with the number of the games.
+def main():
+   args = parse_arguments()
+   settings = ((args.seed + i, args.height, args.width, args.game_type,
+                args.policy, args.max_pieces) for i in range(args.games))
+   totals = {"score": 0, "lines_cleared": 0, "pieces_placed": 0}
+   max_tile, n_games = 0, 0
+   # writes the results of the given finished games and adds them to the totals
+   def write_results(finished, output):
+      nonlocal max_tile, n_games
+      for future in finished:
+         result = future.result()
+         output.write(json.dumps(result) + "\n")
+         for key in totals:
+            totals[key] += result[key]
+         max_tile = max(max_tile, result["max_tile"])
+         n_games += 1
+   start_time = time.perf_counter()
+   with ProcessPoolExecutor(max_workers=args.workers) as executor, \
+        open(args.output, "w") as output:
+      pending = set()
+      for game_settings in settings:
+         # wait for a game to finish when the window of the games is full
+         if len(pending) >= 4 * args.workers:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            write_results(finished, output)
+         pending.add(executor.submit(run_game, game_settings))
+      write_results(wait(pending)[0], output)
+   elapsed = time.perf_counter() - start_time
+   print("games: %d (%d workers, policy %s, %d x %d, %s)" % (n_games, args.workers,
+         args.policy, args.height, args.width, args.game_type))
+   for key in totals:
+      print("mean %s: %.2f" % (key, totals[key] / max(n_games, 1)))
+   print("max tile: %d" % max_tile)
+   print("time: %.2f s, games/sec: %.2f" % (elapsed, n_games / elapsed))
+   print("results: " + args.output)
+
+if __name__ == '__main__':
+   main()
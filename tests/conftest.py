@@ -0,0 +1,5 @@
+import os  # used for finding the directory of the game modules
+import sys  # used for importing the game modules in the tests
+
+# the game modules are in the parent directory of the tests
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
@@ -0,0 +1,47 @@
+from game_grid import GameGrid  # the class for modeling the game grid
+
+# The actions applied in turn to the current tetromino in the test games
+ACTIONS = ("left", "clockwise", "right", "right", "down", "drop")
+
+# Function that plays the given tick of the game on the given game grid and 
+# appends the tetromino that enters the game grid at this tick and its spawn 
+# position to the given list
+def play_tick(grid, tick, spawned):
+   tetromino = grid.current_tetromino
+   if tetromino is not None and (len(spawned) == 0 or spawned[-1][0] is not tetromino):
+      spawned.append((tetromino, tetromino.bottom_left_cell.x))
+   if not grid.game_over:
+      grid.apply_action(ACTIONS[tick % len(ACTIONS)])
+      grid.step()
+
+# Function that returns the type, the spawn position and the tile numbers of 
+# each given tetromino
+def describe(spawned):
+   return [(tetromino.type, x, tuple(tile.number for tile in tetromino.tiles))
+           for tetromino, x in spawned]
+
+# The tetrominoes of a small game grid enter inside it although a larger game
+# grid is created after it
+def test_grids_of_different_sizes_do_not_share_bounds():
+   small = GameGrid(16, 8, 5, 0, 0, "easy", seed=1)
+   GameGrid(24, 20, 5, 0, 0, "easy", seed=2)
+   spawned = []
+   for tick in range(2000):
+      play_tick(small, tick, spawned)
+   assert small.game_over
+   for tetromino, x in spawned:
+      assert 0 <= x <= small.grid_width - tetromino.n
+
+# The same seed gives the same game when another game grid is played between 
+# its ticks
+def test_same_seed_gives_same_game_with_other_grids():
+   alone, expected = GameGrid(16, 8, 5, 0, 0, "hard", seed=7), []
+   for tick in range(300):
+      play_tick(alone, tick, expected)
+   grid, spawned = GameGrid(16, 8, 5, 0, 0, "hard", seed=7), []
+   other, other_spawned = GameGrid(24, 20, 5, 0, 0, "hard", seed=8), []
+   for tick in range(300):
+      play_tick(grid, tick, spawned)
+      play_tick(other, tick, other_spawned)
+   assert describe(spawned) == describe(expected)
+   assert grid.score == alone.score
@@ -0,0 +1,70 @@
+import random  # used for the random number generators of the tetrominoes
+import pytest  # used for running the same test with different parameters
+from game_grid import GameGrid  # the class for modeling the game grid
+from tetromino import Tetromino, KICK_TABLE, TETROMINO_TYPES  # the tested class
+
+# Function that returns an empty game grid with the given rotation system
+def create_grid(rotation_system):
+   return GameGrid(16, 8, 5, 0, 0, "easy", rotation_system, seed=0)
+
+# Function that returns a tetromino of the given type with the given rotation
+# index at the given position on the given game grid
+def create_tetromino(grid, type, rotation, x, y):
+   tetromino = Tetromino(type, random.Random(0), grid.grid_width, grid.grid_height)
+   tetromino.rotation = rotation
+   tetromino.bottom_left_cell.x, tetromino.bottom_left_cell.y = x, y
+   return tetromino
+
+# The vertical I and T tetrominoes at the left and the right walls that are 
+# rotated clockwise into positions out of the game grid and the kicks that 
+# move them inside it under SRS: the rotation index 0 of the I tetromino is the
+# SRS left state (kicks of L -> 0), the rotation indexes 3 and 1 of the T 
+# tetromino are the SRS right (R -> 2) and left (L -> 0) states
+WALL_KICKS = [
+   ("I", 0, -1, (1, 0)),  # the vertical I in the leftmost column
+   ("I", 0, 6, (-2, 0)),  # the vertical I in the rightmost column
+   ("T", 3, -1, (1, 0)),  # the T pointing right in the leftmost columns
+   ("T", 1, 6, (-1, 0))   # the T pointing left in the rightmost columns
+]
+
+# Each rotation state of each tetromino type has a kick list for both 
+# directions which starts with the rotation in place
+def test_kick_table_is_complete():
+   for type in TETROMINO_TYPES:
+      for rotation in range(4):
+         for new_rotation in ((rotation + 1) % 4, (rotation - 1) % 4):
+            assert KICK_TABLE[type][(rotation, new_rotation)][0] == (0, 0)
+
+# The tetrominoes rotated off the walls are kicked inside the game grid (SRS)
+@pytest.mark.parametrize("type, rotation, x, kick", WALL_KICKS)
+def test_srs_kicks_off_the_walls(type, rotation, x, kick):
+   grid = create_grid("srs")
+   tetromino = create_tetromino(grid, type, rotation, x, 5)
+   assert tetromino.rotate_tetromino("clockwise", grid)
+   assert tetromino.rotation == (rotation + 1) % 4
+   assert (tetromino.bottom_left_cell.x, tetromino.bottom_left_cell.y) == (x + kick[0], 5 + kick[1])
+   assert tetromino.fits(grid, x + kick[0], 5 + kick[1], tetromino.rotation)
+
+# The same rotations are rejected when the tetrominoes are rotated in place
+@pytest.mark.parametrize("type, rotation, x, kick", WALL_KICKS)
+def test_classic_rejects_rotations_off_the_walls(type, rotation, x, kick):
+   grid = create_grid("classic")
+   tetromino = create_tetromino(grid, type, rotation, x, 5)
+   assert not tetromino.rotate_tetromino("clockwise", grid)
+   assert tetromino.rotation == rotation
+   assert (tetromino.bottom_left_cell.x, tetromino.bottom_left_cell.y) == (x, 5)
+
+# A rotation into the locked tiles is rejected by both rotation systems when
+# all the cells around the tetromino are occupied
+@pytest.mark.parametrize("rotation_system", ["classic", "srs"])
+@pytest.mark.parametrize("type", ["I", "T"])
+def test_rotation_into_locked_tiles_is_rejected(rotation_system, type):
+   grid = create_grid(rotation_system)
+   tetromino = create_tetromino(grid, type, 0, 3, 6)
+   occupied = {(x, y) for x, y, tile in tetromino.get_cells()}
+   grid.update_grid([(x, y, 1) for x in range(grid.grid_width)
+                     for y in range(grid.grid_height) if (x, y) not in occupied])
+   for direction in ("clockwise", "counterclockwise"):
+      assert not tetromino.rotate_tetromino(direction, grid)
+      assert tetromino.rotation == 0
+      assert (tetromino.bottom_left_cell.x, tetromino.bottom_left_cell.y) == (3, 6)
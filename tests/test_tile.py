@@ -0,0 +1,97 @@
+import random  # used for generating the random tile matrices
+import numpy as np  # fundamental Python module for scientific computing
+from tile import Tile  # the tested class
+
+# Function that merges the given tile matrix (the exponents of the numbers on 
+# the tiles where the row 0 is the bottom row) by the previous nested-loop 
+# merge pass that visits the cells column by column from the bottom and 
+# returns the resulting tile matrix and the increase in the score
+def reference_merge(tile_matrix):
+   matrix = tile_matrix.tolist()
+   n_rows, n_cols = tile_matrix.shape
+   score = 0
+   is_empty = lambda row, col: matrix[row][col] == 0
+   for col in range(n_cols):
+      for row in range(n_rows):
+         # merge the tile with the equal tile on top of it (the upper tile is 
+         # removed but the tiles with the max number are not doubled) and move 
+         # the tiles above the removed tile down by one
+         if row + 1 < n_rows and matrix[row][col] != 0 and \
+            matrix[row][col] == matrix[row + 1][col]:
+            if matrix[row][col] < Tile.max_exponent:
+               matrix[row][col] += 1
+               score += 2 ** matrix[row][col]
+            matrix[row + 1][col] = 0
+            for row_index in range(row + 1, n_rows):
+               if not is_empty(row_index, col):
+                  matrix[row_index - 1][col] = matrix[row_index][col]
+                  matrix[row_index][col] = 0
+         # the tile falls down by one when it has no neighbours (except in the
+         # bottom row)
+         above = row + 1 >= n_rows or is_empty(row + 1, col)
+         below = row - 1 < 0 or is_empty(row - 1, col)
+         left = col - 1 < 0 or is_empty(row, col - 1)
+         right = col + 1 >= n_cols or is_empty(row, col + 1)
+         if row != 0 and not is_empty(row, col) and above and below and left and right:
+            matrix[row - 1][col] = matrix[row][col]
+            matrix[row][col] = 0
+   return np.array(matrix, dtype=tile_matrix.dtype), score
+
+# Function that returns the tile matrix with the given rows of exponents which
+# are given from the top row as they are displayed
+def create_matrix(*rows):
+   return np.array(rows[::-1], dtype=np.uint8)
+
+# Function that checks that Tile.merge_tiles gives the same tile matrix and 
+# score as the reference merge and returns them
+def merge_and_compare(tile_matrix):
+   merged, score = Tile.merge_tiles(tile_matrix.copy())
+   expected, expected_score = reference_merge(tile_matrix)
+   assert np.array_equal(merged, expected), (tile_matrix, merged, expected)
+   assert score == expected_score
+   return merged, score
+
+# The merge of the random tile matrices is the same as the reference merge
+def test_merge_matches_reference_on_random_grids():
+   rng = random.Random(2048)
+   for _ in range(3000):
+      n_rows, n_cols = rng.randint(1, 9), rng.randint(1, 9)
+      density, max_exponent = rng.random(), rng.choice([2, 3, Tile.max_exponent])
+      tile_matrix = np.array([[rng.randint(1, max_exponent) if rng.random() < density else 0
+                               for col in range(n_cols)] for row in range(n_rows)],
+                             dtype=np.uint8)
+      # the tile matrices with the same number on all the tiles
+      if rng.random() < 0.3:
+         tile_matrix[tile_matrix > 0] = rng.choice([1, Tile.max_exponent])
+      merge_and_compare(tile_matrix)
+
+# The equal tiles with the max number (2048) are not doubled but the upper 
+# tile is removed
+def test_max_tiles_are_not_doubled():
+   merged, score = merge_and_compare(create_matrix([11, 0],
+                                                   [11, 1]))
+   assert np.array_equal(merged, create_matrix([0, 0],
+                                               [11, 1]))
+   assert score == 0
+
+# In a run of three equal tiles, the lower pair is merged and the third tile
+# is moved down on the merged tile
+def test_run_of_three_merges_the_lower_pair():
+   merged, score = merge_and_compare(create_matrix([1],
+                                                   [1],
+                                                   [1]))
+   assert np.array_equal(merged, create_matrix([0],
+                                               [1],
+                                               [2]))
+   assert score == 4
+
+# An isolated tile does not fall when its left neighbour has fallen next to 
+# it in the same pass
+def test_isolated_tile_next_to_falling_left_neighbour():
+   merged, score = merge_and_compare(create_matrix([1, 0],
+                                                   [0, 2],
+                                                   [0, 0]))
+   assert np.array_equal(merged, create_matrix([0, 0],
+                                               [1, 2],
+                                               [0, 0]))
+   assert score == 0
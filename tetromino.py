@@ -1,142 +1,169 @@
 from tile import Tile  # used for modeling each tile on the tetromino
 from point import Point  # used for tile positions
-import copy as cp  # the copy module is used for copying tiles and positions
-import random  # module for generating random values/permutations
 import numpy as np  # the fundamental Python module for scientific computing
+from collections import namedtuple  # used for the rotation states
+
+# The types (shapes) of the tetrominoes
+TETROMINO_TYPES = ("I", "J", "L", "O", "S", "T", "Z")
+
+# The shapes of the tetrominoes in their initial orientations as the size n of 
+# the n x n tile matrix (n = number of rows = number of columns) and the 
+# (column_index, row_index) pairs of the occupied tiles (minos) in this matrix 
+# where the row indexes are counted from the top row of the matrix
+TETROMINO_SHAPES = {
+   "I": (4, ((1, 0), (1, 1), (1, 2), (1, 3))),
+   "O": (2, ((0, 0), (1, 0), (0, 1), (1, 1))),
+   "Z": (3, ((0, 0), (1, 0), (1, 1), (2, 1))),
+   "S": (3, ((1, 0), (2, 0), (1, 1), (0, 1))),
+   "J": (3, ((1, 0), (1, 1), (1, 2), (0, 2))),
+   "L": (3, ((1, 0), (1, 1), (1, 2), (2, 2))),
+   "T": (3, ((0, 1), (1, 1), (2, 1), (1, 2)))
+}
+
+# A rotation state of a tetromino: the (dx, dy) offsets of its tiles from the 
+# bottom left cell of its tile matrix (in the same order for all the rotations 
+# so that each tile keeps its number), the occupancy bitmasks of the rows of 
+# the tile matrix from the bottom row (bit dx is set when the cell at dx is 
+# occupied), the min and max dx of the tiles, the min dy of the tiles and the
+# (dx, min dy) pairs of the lowest tiles in the columns of the tile matrix
+RotationState = namedtuple("RotationState", 
+                           ["cells", "row_masks", "min_col", "max_col", "min_row",
+                            "column_bottoms"])
+
+# Function that computes the 4 rotation states of the given tetromino type 
+# where the rotation index is the number of clockwise rotations from the initial
+# orientation
+def get_rotation_states(type):
+   n, occupied_tiles = TETROMINO_SHAPES[type]
+   # the matrix of the tile indexes (-1 for the empty cells)
+   tile_indexes = np.full((n, n), -1)
+   for i, (col_index, row_index) in enumerate(occupied_tiles):
+      tile_indexes[row_index][col_index] = i
+   rotation_states = []
+   for rotation in range(4):
+      # rotate the matrix clockwise by the given number of rotations
+      rotated = np.rot90(tile_indexes, -rotation)
+      cells = [None] * len(occupied_tiles)
+      row_masks = [0] * n
+      for row in range(n):
+         for col in range(n):
+            if rotated[row][col] != -1:
+               dy = (n - 1) - row
+               cells[rotated[row][col]] = (col, dy)
+               row_masks[dy] |= 1 << col
+      cols = [dx for dx, dy in cells]
+      rows = [dy for dx, dy in cells]
+      column_bottoms = tuple((col, min(dy for dx, dy in cells if dx == col))
+                             for col in sorted(set(cols)))
+      rotation_states.append(RotationState(tuple(cells), tuple(row_masks),
+                                           min(cols), max(cols), min(rows),
+                                           column_bottoms))
+   return tuple(rotation_states)
+
+# The rotation states of all the tetromino types (computed once)
+ROTATION_TABLE = {type: get_rotation_states(type) for type in TETROMINO_TYPES}
+
+# The initial (spawn) orientations of the tetrominoes in the Super Rotation 
+# System (SRS) as the (column_index, row_index) pairs of the occupied tiles in 
+# the tile matrix (the row indexes are counted from the top row of the matrix)
+SRS_SHAPES = {
+   "I": ((0, 1), (1, 1), (2, 1), (3, 1)),
+   "O": ((0, 0), (1, 0), (0, 1), (1, 1)),
+   "Z": ((0, 0), (1, 0), (1, 1), (2, 1)),
+   "S": ((1, 0), (2, 0), (0, 1), (1, 1)),
+   "J": ((0, 0), (0, 1), (1, 1), (2, 1)),
+   "L": ((2, 0), (0, 1), (1, 1), (2, 1)),
+   "T": ((1, 0), (0, 1), (1, 1), (2, 1))
+}
+
+# The SRS wall kicks, i.e. the (dx, dy) offsets tried in order when rotating
+# a tetromino from an SRS rotation state to another (0 = spawn, 1 = right, 
+# 2 = two rotations, 3 = left) where dy > 0 is upwards
+SRS_KICKS = {
+   "JLSTZ": {
+      (0, 1): ((0, 0), (-1, 0), (-1, 1), (0, -2), (-1, -2)),
+      (1, 0): ((0, 0), (1, 0), (1, -1), (0, 2), (1, 2)),
+      (1, 2): ((0, 0), (1, 0), (1, -1), (0, 2), (1, 2)),
+      (2, 1): ((0, 0), (-1, 0), (-1, 1), (0, -2), (-1, -2)),
+      (2, 3): ((0, 0), (1, 0), (1, 1), (0, -2), (1, -2)),
+      (3, 2): ((0, 0), (-1, 0), (-1, -1), (0, 2), (-1, 2)),
+      (3, 0): ((0, 0), (-1, 0), (-1, -1), (0, 2), (-1, 2)),
+      (0, 3): ((0, 0), (1, 0), (1, 1), (0, -2), (1, -2))
+   },
+   "I": {
+      (0, 1): ((0, 0), (-2, 0), (1, 0), (-2, -1), (1, 2)),
+      (1, 0): ((0, 0), (2, 0), (-1, 0), (2, 1), (-1, -2)),
+      (1, 2): ((0, 0), (-1, 0), (2, 0), (-1, 2), (2, -1)),
+      (2, 1): ((0, 0), (1, 0), (-2, 0), (1, -2), (-2, 1)),
+      (2, 3): ((0, 0), (2, 0), (-1, 0), (2, 1), (-1, -2)),
+      (3, 2): ((0, 0), (-2, 0), (1, 0), (-2, -1), (1, 2)),
+      (3, 0): ((0, 0), (1, 0), (-2, 0), (1, -2), (-2, 1)),
+      (0, 3): ((0, 0), (-1, 0), (2, 0), (-1, 2), (2, -1))
+   }
+}
+
+# Function that computes the SRS wall kicks of the given tetromino type for
+# each (rotation index, rotation index after a clockwise or counterclockwise 
+# rotation) pair of the rotation states in ROTATION_TABLE
+def get_kicks(type):
+   n = TETROMINO_SHAPES[type][0]
+   rotation_states = ROTATION_TABLE[type]
+   # find the rotation state that is the SRS spawn orientation
+   srs_cells = {(col, (n - 1) - row) for col, row in SRS_SHAPES[type]}
+   spawn_rotations = [rotation for rotation in range(4)
+                      if set(rotation_states[rotation].cells) == srs_cells]
+   if len(spawn_rotations) == 0:
+      raise ValueError("no rotation state of " + type + " matches its SRS spawn shape")
+   # (all the rotation states of the O tetromino match and it is not kicked)
+   spawn_rotation = spawn_rotations[0]
+   kicks = {}
+   for rotation in range(4):
+      for new_rotation in ((rotation + 1) % 4, (rotation - 1) % 4):
+         # the O tetromino is not kicked
+         if type == "O":
+            kicks[(rotation, new_rotation)] = ((0, 0),)
+            continue
+         srs_rotations = ((rotation - spawn_rotation) % 4,
+                          (new_rotation - spawn_rotation) % 4)
+         kick_table = SRS_KICKS["I"] if type == "I" else SRS_KICKS["JLSTZ"]
+         kicks[(rotation, new_rotation)] = kick_table[srs_rotations]
+   return kicks
+
+# The SRS wall kicks of all the tetromino types (computed once)
+KICK_TABLE = {type: get_kicks(type) for type in TETROMINO_TYPES}
 
 # Class used for modeling tetrominoes with 7 different types/shapes 
 # as (I, O, Z, S, J, L, T)
 class Tetromino:
-   # The dimensions of the game grid
-   grid_height, grid_width = None, None
-
-   # Constructor for creating a tetromino with a given type (shape)
-   def __init__(self, type):
+   # Constructor for creating a tetromino with a given type (shape) that enters
+   # a game grid with the given dimensions where the numbers on its tiles and 
+   # its horizontal position are chosen by using the given random number 
+   # generator
+   def __init__(self, type, rng, grid_width, grid_height):
       # set the shape of the tetromino based on the given type
       self.type = type
-      # determine the occupied (non-empty) tiles in the tile matrix
-      occupied_tiles = []
-      if type == 'I':
-         n = 4  # n = number of rows = number of columns in the tile matrix
-         # shape of the tetromino I in its initial orientation
-         occupied_tiles.append((1, 0)) # (column_index, row_index) 
-         occupied_tiles.append((1, 1))
-         occupied_tiles.append((1, 2))
-         occupied_tiles.append((1, 3))          
-      elif type == 'O':
-         n = 2  # n = number of rows = number of columns in the tile matrix
-         # shape of the tetromino O in its initial orientation
-         occupied_tiles.append((0, 0)) # (column_index, row_index) 
-         occupied_tiles.append((1, 0))
-         occupied_tiles.append((0, 1))
-         occupied_tiles.append((1, 1)) 
-      elif type == 'Z':
-         n = 3  # n = number of rows = number of columns in the tile matrix
-         # shape of the tetromino Z in its initial orientation
-         occupied_tiles.append((0, 0)) # (column_index, row_index) 
-         occupied_tiles.append((1, 0))
-         occupied_tiles.append((1, 1))
-         occupied_tiles.append((2, 1))
-      elif type == 'S':
-         n = 3 # n = number of rows = number of columns in the tile matrix
-         # shape of the tetromino S in its initial orientation
-         occupied_tiles.append((1, 0)) # (column_index, row_index)
-         occupied_tiles.append((2, 0))
-         occupied_tiles.append((1, 1))
-         occupied_tiles.append((0, 1))
-      elif type == 'J':
-         n = 3 # n = number of rows = number of columns in the tile matrix
-         # shape of the tetromino J in its initial orientation
-         occupied_tiles.append((1, 0)) # (column_index, row_index)
-         occupied_tiles.append((1, 1))
-         occupied_tiles.append((1, 2))
-         occupied_tiles.append((0, 2))
-      elif type == 'L':
-         n = 3 # n = number of rows = number of columns in the tile matrix
-         # shape of the tetromino L in its initial orientation
-         occupied_tiles.append((1, 0))
-         occupied_tiles.append((1, 1))
-         occupied_tiles.append((1, 2))
-         occupied_tiles.append((2, 2))
-      elif type == 'T':
-         n = 3 # n = number of rows = number of columns in the tile matrix
-         # shape of the tetromino T in its initial orientation
-         occupied_tiles.append((0, 1))
-         occupied_tiles.append((1, 1))
-         occupied_tiles.append((2, 1))
-         occupied_tiles.append((1, 2))
-      
-      # create a matrix of numbered tiles based on the shape of the tetromino
-      self.tile_matrix = np.full((n, n), None)
-      # create the four tiles (minos) of the tetromino and place these tiles
-      # into the tile matrix
-      for i in range(len(occupied_tiles)):
-         col_index, row_index = occupied_tiles[i][0], occupied_tiles[i][1]
-         # create the tile at the computed position 
-         self.tile_matrix[row_index][col_index] = Tile()
+      # n = number of rows = number of columns in the tile matrix
+      self.n = TETROMINO_SHAPES[type][0]
+      # the rotation states of the tetromino and the index of the current one
+      self.rotation_states = ROTATION_TABLE[type]
+      self.rotation = 0
+      # create the four tiles (minos) of the tetromino
+      self.tiles = [Tile(rng=rng) for i in range(len(self.rotation_states[0].cells))]
       # initialize the position of the tetromino (the bottom left cell in the 
       # tile matrix) with a random horizontal position above the game grid 
       self.bottom_left_cell = Point()
-      self.bottom_left_cell.y = self.grid_height - 1
-      self.bottom_left_cell.x = random.randint(0, self.grid_width - n)
-
-   # Method that returns the position of the cell in the tile matrix specified 
-   # by the given row and column indexes
-   def get_cell_position(self, row, col):
-      n = len(self.tile_matrix)  # n = number of rows = number of columns
-      position = Point()
-      # horizontal position of the cell
-      position.x = self.bottom_left_cell.x + col
-      # vertical position of the cell
-      position.y = self.bottom_left_cell.y + (n - 1) - row
-      return position
-
-   # Method that returns a copy of tile_matrix omitting empty rows and columns
-   # and the position of the bottom left cell when return_position is set
-   def get_min_bounded_tile_matrix(self, return_position = False):
-      n = len(self.tile_matrix)  # n = number of rows = number of columns
-      # determine rows and columns to copy (omit empty rows and columns)
-      min_row, max_row, min_col, max_col = n - 1, 0, n - 1, 0
-      for row in range(n):
-         for col in range(n):
-            if self.tile_matrix[row][col] is not None:
-               if row < min_row:
-                  min_row = row
-               if row > max_row:
-                  max_row = row
-               if col < min_col:
-                  min_col = col
-               if col > max_col:
-                  max_col = col
-      # copy the tiles from the tile matrix and return the resulting copy
-      copy = np.full((max_row - min_row + 1, max_col - min_col + 1), None)
-      for row in range(min_row, max_row + 1):
-         for col in range(min_col, max_col + 1):
-            if self.tile_matrix[row][col] is not None:
-               row_ind = row - min_row
-               col_ind = col - min_col
-               copy[row_ind][col_ind] = cp.deepcopy(self.tile_matrix[row][col])
-      # return just the resulting copy matrix when return_position is not set
-      if not return_position:
-         return copy
-      # otherwise return the position of the bottom left cell in copy as well
-      else:
-         blc_position = cp.copy(self.bottom_left_cell)
-         blc_position.translate(min_col, (n - 1) - max_row)
-         return copy, blc_position
-      
-   # Method for drawing the tetromino on the game grid
-   def draw(self, is_ghost = False):
-      n = len(self.tile_matrix)  # n = number of rows = number of columns
-      for row in range(n):
-         for col in range(n):
-            # draw each occupied tile (not equal to None) on the game grid
-            if self.tile_matrix[row][col] is not None:
-               # get the position of the tile
-               position = self.get_cell_position(row, col)
-               # draw only the tiles that are inside the game grid
-               if position.y < self.grid_height:
-                  self.tile_matrix[row][col].draw(position, is_ghost=is_ghost)
+      self.bottom_left_cell.y = grid_height - 1
+      self.bottom_left_cell.x = rng.randint(0, grid_width - self.n)
+
+   # Method that returns the positions of the tiles of the tetromino on the game
+   # grid together with the tiles as a list of (x, y, tile) tuples when its 
+   # bottom left cell is at the given (x, y) position (the current position of
+   # the tetromino by default)
+   def get_cells(self, x = None, y = None):
+      if x is None:
+         x, y = self.bottom_left_cell.x, self.bottom_left_cell.y
+      cells = self.rotation_states[self.rotation].cells
+      return [(x + dx, y + dy, tile) for (dx, dy), tile in zip(cells, self.tiles)]
 
    # Method for moving the tetromino in a given direction by 1 on the game grid
    def move(self, direction, game_grid):
@@ -156,99 +183,104 @@ class Tetromino:
    
    # Rotate 90 degrees clockwise and counter clockwise the tetromino
    def rotate_tetromino(self, direction, game_grid):
-      # check if the tetromino can be rotated in the given direction by using the
-      # can_be_rotated method defined below
-      if not(self.can_be_rotated(direction, game_grid)):
+      # find the offset that the tetromino is moved by while it is rotated in 
+      # the given direction by using the get_rotation_kick method defined below
+      kick = self.get_rotation_kick(direction, game_grid)
+      if kick is None:
          return False
-      # Rotate tetromino 90 degree # up = clockwise
-      if direction == "d":
-         # get the copy of the tile matrix and the position of the bottom left 
-         # cell in the copy
-         self.tile_matrix = np.rot90(self.tile_matrix, 3)
-      elif direction == "a":
-         # get the copy of the tile matrix and the position of the bottom left 
-         # cell in the copy
-         self.tile_matrix = np.rot90(self.tile_matrix, 1)
+      # rotating the tetromino is just changing the index of its rotation state
+      self.rotation = self.get_rotation(direction)
+      self.bottom_left_cell.translate(kick[0], kick[1])
       return True
+
+   # Method that returns the index of the rotation state of the tetromino after
+   # it is rotated in the given direction
+   def get_rotation(self, direction):
+      if direction == "clockwise":
+         return (self.rotation + 1) % 4
+      return (self.rotation - 1) % 4
    
    # Method for checking if the tetromino can be rotated in the given direction
    def can_be_rotated(self, dir, game_grid):
-      n = len(self.tile_matrix)  # n = number of rows = number of columns
-      # get the copy of the tile matrix
-      copy_of_tile_matrix = cp.copy(self.tile_matrix)
-      copy_of_tile_matrix = np.rot90(copy_of_tile_matrix, 1)
+      return self.get_rotation_kick(dir, game_grid) is not None
 
-      for row in range(n):
-         for col in range(n):
-            if dir == "d" and copy_of_tile_matrix[row][col] is not None:
-               # get the position of the tile
-               position = self.get_cell_position(row, col)
-               # check if the tile is inside the game grid
-               if position.y < 0 or position.x < 0 or position.x >= self.grid_width:
-                  return False
-
-            elif dir == "a" and copy_of_tile_matrix[row][col] is not None:
-               # get the position of the tile
-               position = self.get_cell_position(row, col)
-               # check if the tile is inside the game grid
-               if position.y < 0 or position.x < 0 or position.x >= self.grid_width:
-                  return False
-      return True
+   # Method that returns the first (dx, dy) offset (wall kick) such that the 
+   # tetromino rotated in the given direction and moved by this offset is inside
+   # the game grid (tiles above the game grid are allowed for newly entered 
+   # tetrominoes) and does not collide with the locked tiles, or None when the 
+   # tetromino cannot be rotated. The tetromino is only rotated in place with 
+   # the "classic" rotation system of the game grid while the "srs" rotation 
+   # system tries the wall kicks of the Super Rotation System as well.
+   def get_rotation_kick(self, direction, game_grid):
+      rotation = self.get_rotation(direction)
+      if game_grid.rotation_system == "srs":
+         kicks = KICK_TABLE[self.type][(self.rotation, rotation)]
+      else:
+         kicks = ((0, 0),)
+      x, y = self.bottom_left_cell.x, self.bottom_left_cell.y
+      for dx, dy in kicks:
+         if not self.is_inside_grid(game_grid, x + dx, y + dy, rotation):
+            continue
+         if not self.collides(game_grid, x + dx, y + dy, rotation):
+            return (dx, dy)
+      return None
 
    # Method to check if the tetromino can be moved in the given direction or not
    def can_be_moved(self, dir, game_grid):
-      n = len(self.tile_matrix)  # n = number of rows = number of columns
-      # check for moving left or right
-      if dir == "left" or dir == "right":
-         for row in range(n):
-            for col in range(n): 
-               # direction = left --> check the leftmost tile of each row
-               if dir == "left" and self.tile_matrix[row][col] is not None:
-                  leftmost = self.get_cell_position(row, col)
-                  # tetromino cannot go left if any leftmost tile is at x = 0
-                  if leftmost.x == 0:
-                     return False
-                  # skip each row whose leftmost tile is out of the game grid 
-                  # (possible for newly entered tetrominoes to the game grid)
-                  if leftmost.y >= self.grid_height:
-                     break
-                  # the tetromino cannot go left if the grid cell on the left of 
-                  # any leftmost tile is occupied
-                  if game_grid.is_occupied(leftmost.y, leftmost.x - 1):
-                     return False
-                  break  # end the inner for loop
-               # direction = right --> check the rightmost tile of each row
-               elif dir == "right" and self.tile_matrix[row][n-1-col] is not None:
-                  rightmost = self.get_cell_position(row, n - 1 - col)
-                  # the tetromino cannot go right if any rightmost tile is at
-                  # x = grid_width - 1
-                  if rightmost.x == self.grid_width - 1:
-                     return False
-                  # skip each row whose rightmost tile is out of the game grid 
-                  # (possible for newly entered tetrominoes to the game grid)
-                  if rightmost.y >= self.grid_height:
-                     break
-                  # the tetromino cannot go right if the grid cell on the right 
-                  # of any rightmost tile is occupied
-                  if game_grid.is_occupied(rightmost.y, rightmost.x + 1):
-                     return False
-                  break  # end the inner for loop
-               # direction = up --> check the topmost tile of each column
-      # direction = down --> check the bottommost tile of each column
-      else:
-         for col in range(n):
-            for row in range(n - 1, -1, -1):
-               if self.tile_matrix[row][col] is not None:
-                  bottommost = self.get_cell_position(row, col)
-                  # skip each column whose bottommost tile is out of the grid 
-                  # (possible for newly entered tetrominoes to the game grid)
-                  if bottommost.y > self.grid_height:
-                     break
-                  # tetromino cannot go down if any bottommost tile is at y = 0
-                  if bottommost.y == 0:
-                     return False 
-                  # or the grid cell below any bottommost tile is occupied
-                  if game_grid.is_occupied(bottommost.y - 1, bottommost.x):
-                     return False
-                  break  # end the inner for loop
-      return True  # tetromino can be moved in the given direction
+      x, y = self.bottom_left_cell.x, self.bottom_left_cell.y
+      if dir == "left":
+         x -= 1
+      elif dir == "right":
+         x += 1
+      else:  # direction == "down"
+         y -= 1
+      # the tetromino can be moved when all of its tiles are inside the game 
+      # grid and none of them collides with the tiles locked on the game grid
+      if not self.is_inside_grid(game_grid, x, y, self.rotation):
+         return False
+      return not self.collides(game_grid, x, y, self.rotation)
+
+   # Method that returns the number of rows that the tetromino can go down on 
+   # the game grid until it lands (used for the hard drop and the ghost) from 
+   # the given position with the given rotation (the current position and
+   # rotation of the tetromino by default)
+   def get_drop_distance(self, game_grid, x = None, y = None, rotation = None):
+      if x is None:
+         x, y = self.bottom_left_cell.x, self.bottom_left_cell.y
+      if rotation is None:
+         rotation = self.rotation
+      # the tetromino moves down until the lowest tile in one of its columns
+      # lands on a locked tile or the bottom of the game grid
+      return min(y + dy - game_grid.get_landing_row(x + dx, y + dy)
+                 for dx, dy in self.rotation_states[rotation].column_bottoms)
+
+   # Method that checks whether the tetromino with the given rotation fits on 
+   # the game grid, i.e. it is inside the game grid (except its top) and does 
+   # not collide with the locked tiles, when its bottom left cell is at (x, y)
+   def fits(self, game_grid, x, y, rotation):
+      if not self.is_inside_grid(game_grid, x, y, rotation):
+         return False
+      return not self.collides(game_grid, x, y, rotation)
+
+   # Method that checks whether the tetromino with the given rotation is inside 
+   # the given game grid (except its top) when its bottom left cell is at (x, y)
+   def is_inside_grid(self, game_grid, x, y, rotation):
+      state = self.rotation_states[rotation]
+      if x + state.min_col < 0 or x + state.max_col >= game_grid.grid_width:
+         return False
+      return y + state.min_row >= 0
+
+   # Method that checks whether any tile of the tetromino with the given rotation
+   # collides with the tiles locked on the game grid when its bottom left cell
+   # is at (x, y) by using the occupancy bitmasks of the game grid rows
+   def collides(self, game_grid, x, y, rotation):
+      grid_masks = game_grid.row_masks
+      for i, row_mask in enumerate(self.rotation_states[rotation].row_masks):
+         row = y + i
+         # tiles above or below the game grid cannot collide with locked tiles
+         if row_mask == 0 or row < 0 or row >= game_grid.grid_height:
+            continue
+         shifted = row_mask << x if x >= 0 else row_mask >> -x
+         if grid_masks[row] & shifted:
+            return True
+      return False
\ No newline at end of file
@@ -1,25 +1,34 @@
-import lib.stddraw as stddraw  # stddraw is used as a basic graphics library
 import random # random is used to generate random numbers
 import numpy as np # numpy is used to generate arrays
 from lib.color import Color  # used for coloring the tile and the number on it
 from utils import TILE_COLORS # used for the tile colors
 
-# Class used for modeling numbered tiles as in 2048
+# Class used for modeling numbered tiles as in 2048. The tiles locked on the 
+# game grid are stored as the exponents of their numbers (log2 of the number, 
+# 0 for an empty cell) in a uint8 matrix and Tile objects are only created for 
+# the tetrominoes and for drawing.
 class Tile: 
    # Class attributes shared among all Tile objects
    # ---------------------------------------------------------------------------
-   # the value of the boundary thickness (for the boxes around the tiles)
-   boundary_thickness = 0.004
-   # font family and size used for displaying the tile number
-   font_family, font_size = "Arial", 14
+   # the max number on a tile (tiles with this number are not merged anymore)
+   max_number = 2048
+   max_exponent = 11
+   # the tile numbers indexed by their exponents (0 is used for empty cells)
+   numbers = np.array([0] + [2 ** exponent for exponent in range(1, max_exponent + 1)])
+   # the boundary color of the tiles (the colors are shared among the tiles)
+   box_color = Color(132, 122, 113)
+   # the attributes of the tiles (no instance dictionary is created)
+   __slots__ = ("number", "background_color", "foreground_color")
 
-   # Constructor that creates a tile with 2 as the number on it
-   def __init__(self):
+   # Constructor that creates a tile with the given number on it or with 2 or 4
+   # as the number on it when the number is not given (chosen by using the 
+   # given random number generator)
+   def __init__(self, number = None, rng = random):
       random_numbers = [2, 4]
       # set the number on the tile
-      self.number = random_numbers[random.randint(0, len(random_numbers) - 1)]
-      # set the boundary color of the tile
-      self.box_color = Color(132, 122, 113) # box (boundary) color
+      if number is None:
+         number = random_numbers[rng.randint(0, len(random_numbers) - 1)]
+      self.number = number
       # set the colors of the tile
       self.update_color()
 
@@ -28,84 +37,76 @@ class Tile:
       self.background_color = TILE_COLORS[self.number]['background_color']
       self.foreground_color = TILE_COLORS[self.number]['foreground_color']
 
-   # Method for drawing the tile
-   def draw(self, position, length = 1, is_ghost = False):
-      # draw the ghost tile
-      if is_ghost:
-         stddraw.setPenColor(Color(167, 160, 151))
-         stddraw.filledSquare(position.x, position.y, length / 2)
-         stddraw.setPenColor(self.background_color)
-         stddraw.setPenRadius(Tile.boundary_thickness)
-         stddraw.square(position.x, position.y, length / 2)
-         stddraw.setPenRadius()  # reset the pen radius to its default value
-         # draw the number on the tile
-         stddraw.setPenColor(Color(255, 255, 255))
-         stddraw.setFontFamily(Tile.font_family)
-         stddraw.setFontSize(Tile.font_size)
-         stddraw.text(position.x, position.y, str(self.number))
-      # draw the tile
-      else:
-         stddraw.setPenColor(self.background_color)
-         stddraw.filledSquare(position.x, position.y, length / 2)
-         stddraw.setPenColor(self.box_color)
-         stddraw.setPenRadius(Tile.boundary_thickness)
-         stddraw.square(position.x, position.y, length / 2)
-         stddraw.setPenRadius()  # reset the pen radius to its default value
-         # draw the number on the tile
-         stddraw.setPenColor(self.foreground_color)
-         stddraw.setFontFamily(Tile.font_family)
-         stddraw.setFontSize(Tile.font_size)
-         stddraw.text(position.x, position.y, str(self.number))
+   # Method that returns the exponent of the number on the tile (log2 of the
+   # number) that is stored in the tile matrix of the game grid
+   def get_exponent(self):
+      return self.number.bit_length() - 1
 
-   # Method for checking two tiles for merging
-   def merge_matches(self, tile):
-   # if the number on the tile is equal to the number on the current tile
-      if self.number == tile.number and self.number < 2048:
-         # set the number on the current tile to the sum of the two numbers
-         self.number = self.number * 2
-         # increase the score by the value of the number on the current tile
-         # Remove the tile and update the color of the current tile
-         tile.number = None
-
-         # Update the color of the current tile
-         self.update_color()
-         # return True to indicate that the tiles were matched
-         return self.number
-      # return False to indicate that the tiles were not matched
-      else:
-         return 0
-
-   # Merges tiles in the tile matrix.
-   def merge_tiles(tile_matrix, score):
-      # iterate through the tile matrix
-      for col in range(len(tile_matrix[0])):
-         for row in range(len(tile_matrix)):
-            try:
-               # if the tile to the top of the current tile is not empty
-               # and the number on the current tile is equal to the number
-               # on the tile to the top merge them
-               if tile_matrix[row][col] != None and tile_matrix[row + 1][col] != None and tile_matrix[row][col].number == tile_matrix[row + 1][col].number:
-                  score += tile_matrix[row][col].merge_matches(tile_matrix[row + 1][col])
-                  tile_matrix[row + 1][col] = None 
-                  # After merging the tiles, move the tiles down
-                  for row_index in range(row + 1, len(tile_matrix)):
-                     if tile_matrix[row_index][col] != None:
-                        tile_matrix[row_index - 1][col] = tile_matrix[row_index][col]
-                        tile_matrix[row_index][col] = None
-            except IndexError:
-               pass
-            # check neighboring tiles
-            right_neighbour = tile_matrix[row + 1][col]  == None if row + 1 < len(tile_matrix) else True
-            up_neighbour    = tile_matrix[row][col + 1]  == None if col + 1 < len(tile_matrix[0]) else True
-            left_neighbour  = tile_matrix[row - 1][col]  == None if row - 1 >= 0 else True
-            down_neighbour  = tile_matrix[row][col - 1]  == None if col - 1 >= 0 else True
-            # if the current tile is not empty and the neighbors are empty
-            # move the current tile to the any empty neighbor
-            # do not do in the first row 
-            if row != 0:
-               if tile_matrix[row][col] != None and right_neighbour and left_neighbour and up_neighbour and down_neighbour:
-                     tile_matrix[row - 1][col] = tile_matrix[row][col]
-                     tile_matrix[row][col] = None 
-                     row -= 1
-            row += 1
-      return score
\ No newline at end of file
+   # Merges tiles in the tile matrix that stores the exponents of the numbers
+   # on the tiles (0 for the empty cells) by processing all the columns at once
+   # and returns the resulting tile matrix and the increase in the score. In a
+   # column, each tile is merged with the equal tile on top of it (pairs are 
+   # formed from the bottom and each tile is merged once), the tiles above a 
+   # merged pair are moved down and then each tile with no neighbours (except 
+   # the ones in the first row) falls down by one row. The columns of tiles on 
+   # the left and on the right of the given tile matrix (not modified) can be 
+   # given when only a part of the game grid is merged.
+   @staticmethod
+   def merge_tiles(tile_matrix, left_column = None, right_column = None):
+      n_rows, n_cols = tile_matrix.shape
+      rows = np.arange(n_rows).reshape(-1, 1)
+      # find the pairs of equal tiles where the tile at row + 1 is on the tile
+      # at row (equal_pairs[row] is set for the lower tile of each pair)
+      lower, upper = tile_matrix[:-1], tile_matrix[1:]
+      equal_pairs = (lower != 0) & (lower == upper)
+      # in a run of equal tiles, every other pair starting from the bottom is
+      # merged (run_length is the number of pairs in the run up to row)
+      last_break = np.maximum.accumulate(np.where(equal_pairs, -1, rows[:-1]), axis=0)
+      run_length = rows[:-1] - last_break
+      merged = equal_pairs & (run_length % 2 == 1)
+      score_delta = 0
+      compacted = tile_matrix
+      if merged.any():
+         # double the number on the lower tile of each merged pair (the tiles 
+         # with the max number are not merged but the upper tile is removed)
+         doubled = merged & (lower < Tile.max_exponent)
+         merged_matrix = tile_matrix.copy()
+         merged_matrix[:-1][doubled] += 1
+         score_delta = int(Tile.numbers[merged_matrix[:-1][doubled]].sum())
+         # remove the upper tile of each merged pair and move the tiles above
+         # it down (compaction)
+         removed = np.zeros((n_rows, n_cols), dtype=bool)
+         removed[1:] = merged
+         target_rows = rows - np.cumsum(removed, axis=0)
+         cols = np.broadcast_to(np.arange(n_cols), (n_rows, n_cols))
+         kept = ~removed
+         compacted = np.zeros_like(tile_matrix)
+         compacted[target_rows[kept], cols[kept]] = merged_matrix[kept]
+      # the tiles that have no tiles above, below and to the right of them 
+      # (before the merge pass for the right neighbours) can fall down by one
+      # row (gravity), the first row is excluded
+      empty = compacted == 0
+      can_fall = np.zeros((n_rows, n_cols), dtype=bool)
+      can_fall[1:] = ~empty[1:] & empty[:-1]
+      can_fall[1:-1] &= empty[2:]
+      can_fall[:, :-1] &= tile_matrix[:, 1:] == 0
+      if right_column is not None:
+         can_fall[:, -1] &= right_column == 0
+      if not can_fall.any():
+         return compacted.copy(), score_delta
+      # the tiles must have no tiles to the left of them after the tiles in the
+      # column on the left are moved as well, so the moves are computed until
+      # they do not change (once per column at most)
+      falling = np.zeros((n_rows, n_cols), dtype=bool)
+      while True:
+         result = compacted.copy()
+         result[falling] = 0
+         result[:-1][falling[1:]] = compacted[1:][falling[1:]]
+         left_empty = np.ones((n_rows, n_cols), dtype=bool)
+         left_empty[:, 1:] = result[:, :-1] == 0
+         if left_column is not None:
+            left_empty[:, 0] = left_column == 0
+         new_falling = can_fall & left_empty
+         if (new_falling == falling).all():
+            return result, score_delta
+         falling = new_falling
\ No newline at end of file
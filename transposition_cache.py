@@ -0,0 +1,75 @@
+import collections  # the ordered dictionary is used as the LRU cache
+import numpy as np  # fundamental Python module for scientific computing
+from tile import Tile  # used for the max exponent of the tile numbers
+
+# Class used for modeling a bounded cache of the values computed for the game
+# grids (e.g. the evaluations of a search-based player) where the grids are
+# identified by their Zobrist hashes: a random 64-bit key is assigned to each
+# tile number in each grid cell and the hash of a grid is the XOR of the keys
+# of its tiles. The least recently used value is removed when the cache is full.
+class TranspositionCache:
+   # Constructor for creating an empty cache that holds at most max_size values
+   # where the seed is used for generating the Zobrist keys
+   def __init__(self, max_size = 2 ** 16, seed = 0):
+      self.max_size = max_size
+      self.seed = seed
+      # (grid hash, ...) -> value, ordered from the least recently used one
+      self.values = collections.OrderedDict()
+      # the Zobrist keys for each grid shape (a flat array of the keys of each
+      # cell and exponent) and the index of the key of the first exponent of
+      # each cell in this array
+      self.zobrist_keys = {}
+      self.hits = self.misses = 0
+
+   # Method that returns the Zobrist keys and the indexes of the keys of the
+   # cells for the given grid shape (created when they are first needed)
+   def get_zobrist_keys(self, shape):
+      if shape not in self.zobrist_keys:
+         n_cells, n_exponents = shape[0] * shape[1], Tile.max_exponent + 1
+         rng = np.random.default_rng(self.seed)
+         keys = rng.integers(0, 2 ** 63, size=(n_cells, n_exponents), dtype=np.uint64)
+         # the empty cells (exponent 0) do not change the hash
+         keys[:, 0] = 0
+         cell_indexes = (np.arange(n_cells) * n_exponents).reshape(shape)
+         self.zobrist_keys[shape] = (keys.ravel(), cell_indexes)
+      return self.zobrist_keys[shape]
+
+   # Method that returns the Zobrist hash of the tiles on the given game grid
+   def hash_grid(self, grid):
+      keys, cell_indexes = self.get_zobrist_keys(grid.tile_matrix.shape)
+      return int(np.bitwise_xor.reduce(keys[cell_indexes + grid.tile_matrix], axis=None))
+
+   # Method that returns the value stored for the given key (e.g. a tuple of
+   # a grid hash and the other state the value depends on) or None when it is
+   # not in the cache
+   def lookup(self, key):
+      value = self.values.get(key)
+      if value is None:
+         self.misses += 1
+         return None
+      self.hits += 1
+      self.values.move_to_end(key)
+      return value
+
+   # Method that stores the given value for the given key and removes the
+   # least recently used value when the cache is full
+   def store(self, key, value):
+      self.values[key] = value
+      self.values.move_to_end(key)
+      if len(self.values) > self.max_size:
+         self.values.popitem(last=False)
+
+   # Method that removes all the values and resets the hit/miss counters
+   def clear(self):
+      self.values.clear()
+      self.hits = self.misses = 0
+
+   # Method that returns the ratio of the lookups that found a value
+   @property
+   def hit_rate(self):
+      lookups = self.hits + self.misses
+      return self.hits / lookups if lookups > 0 else 0.0
+
+   # Method that returns the number of the values in the cache
+   def __len__(self):
+      return len(self.values)
\ No newline at end of file
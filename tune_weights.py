@@ -0,0 +1,151 @@
+import argparse  # used for parsing the command line arguments
+import json  # used for writing and reading the checkpoints
+import os  # used for getting the number of the processors and saving the checkpoints
+import random  # used for sampling the weights of the candidates
+import time  # used for measuring the tuning time
+from concurrent.futures import ProcessPoolExecutor  # used for running the games
+from game_grid import GameGrid  # the class for modeling the game grid
+from ai_player import FEATURES, DEFAULT_WEIGHTS, HeuristicPlayer  # the player tuned
+from simulate import play_game  # used for playing the headless games
+
+# Function that plays a headless game with the heuristic player using the
+# weights of a candidate with the given settings (given as a tuple so that the
+# games can be run by a process pool) and returns the index of the candidate
+# and the score of the game
+def run_candidate_game(settings):
+   index, weights, seed, grid_h, grid_w, game_type, max_pieces, beam_width = settings
+   grid = GameGrid(grid_h, grid_w, 5, 0, 0, game_type, seed=seed)
+   player = HeuristicPlayer(weights, beam_width)
+   play_game(grid, player.get_actions, max_pieces)
+   return index, grid.score
+
+# Function that samples the weights of the given number of candidates from
+# the normal distributions with the given means and standard deviations
+def sample_population(mean, std, size, rng):
+   return [{feature: rng.gauss(mean[feature], std[feature]) for feature in FEATURES}
+           for _ in range(size)]
+
+# Function that returns the means and the standard deviations of the weights
+# of the given elite candidates (the cross-entropy method) where the noise is
+# added to the standard deviations so that the search does not stop early
+def fit_distribution(elite, noise):
+   mean, std = {}, {}
+   for feature in FEATURES:
+      values = [weights[feature] for weights in elite]
+      mean[feature] = sum(values) / len(values)
+      variance = sum((value - mean[feature]) ** 2 for value in values) / len(values)
+      std[feature] = variance ** 0.5 + noise
+   return mean, std
+
+# Function that returns the initial tuning state (the generation, the
+# distribution of the weights, the best weights found and the history of the
+# generations) where the standard deviation of each weight is relative to its
+# default value
+def create_state(initial_std):
+   return {"generation": 0, "mean": dict(DEFAULT_WEIGHTS),
+           "std": {feature: initial_std * max(abs(weight), 0.1)
+                   for feature, weight in DEFAULT_WEIGHTS.items()},
+           "best_weights": dict(DEFAULT_WEIGHTS), "best_fitness": None,
+           "history": [], "elapsed": 0.0}
+
+# Function that writes the given tuning state to the given checkpoint file (a
+# temporary file is replaced so that the checkpoint is never partially written)
+def save_checkpoint(path, state):
+   temp_path = path + ".tmp"
+   with open(temp_path, "w") as file:
+      json.dump(state, file, indent=2)
+   os.replace(temp_path, path)
+
+# Function that reads the tuning state from the given checkpoint file
+def load_checkpoint(path):
+   with open(path) as file:
+      return json.load(file)
+
+# Function that returns the command line arguments of the tuner
+def parse_arguments():
+   parser = argparse.ArgumentParser(description="Tune the weights of the heuristic "
+                                    "player by the cross-entropy method")
+   parser.add_argument("--generations", type=int, default=20,
+                       help="number of generations run (in addition to the resumed ones)")
+   parser.add_argument("--population", type=int, default=24, help="candidates in a generation")
+   parser.add_argument("--elite", type=float, default=0.25,
+                       help="fraction of the best candidates used for the next generation")
+   parser.add_argument("--games", type=int, default=8, help="games played by each candidate")
+   parser.add_argument("--seed", type=int, default=0, help="seed of the tuning")
+   parser.add_argument("--initial-std", type=float, default=1.0,
+                       help="initial standard deviation of each weight (relative to its default)")
+   parser.add_argument("--noise", type=float, default=0.01,
+                       help="noise added to the standard deviations")
+   parser.add_argument("--height", type=int, default=20, help="grid height (16-24)")
+   parser.add_argument("--width", type=int, default=12, help="grid width (8-20)")
+   parser.add_argument("--game-type", default="hard", choices=("easy", "medium", "hard"))
+   parser.add_argument("--max-pieces", type=int, default=500,
+                       help="max number of tetrominoes placed in a game")
+   parser.add_argument("--beam-width", type=int, default=2, help="beam width of the player")
+   parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                       help="number of worker processes")
+   parser.add_argument("-c", "--checkpoint", default="tuning_checkpoint.json",
+                       help="file to which the tuning state is written after each generation")
+   parser.add_argument("--resume", action="store_true",
+                       help="continue the tuning from the checkpoint file")
+   return parser.parse_args()
+
+# Runs the generations of the cross-entropy method where the candidates of
+# each generation are scored by the mean score of their games played on a
+# process pool (the same seeded games for all the candidates of a generation),
+# writes the checkpoint and prints the progress after each generation
+def main():
+   args = parse_arguments()
+   if args.resume and os.path.exists(args.checkpoint):
+      state = load_checkpoint(args.checkpoint)
+      print("resumed from %s at generation %d" % (args.checkpoint, state["generation"]))
+   else:
+      state = create_state(args.initial_std)
+   n_elite = max(1, int(round(args.elite * args.population)))
+   start_time = time.perf_counter()
+   with ProcessPoolExecutor(max_workers=args.workers) as executor:
+      for generations_run in range(1, args.generations + 1):
+         generation_start = time.perf_counter()
+         generation = state["generation"]
+         # the candidates and the games of the generation depend only on the
+         # seed and the generation so that the resumed tuning is reproducible
+         rng = random.Random(args.seed * 1000003 + generation)
+         population = sample_population(state["mean"], state["std"], args.population, rng)
+         seeds = [args.seed + generation * args.games + i for i in range(args.games)]
+         settings = [(index, weights, seed, args.height, args.width, args.game_type,
+                      args.max_pieces, args.beam_width)
+                     for index, weights in enumerate(population) for seed in seeds]
+         fitness = [0.0] * args.population
+         for index, score in executor.map(run_candidate_game, settings):
+            fitness[index] += score / args.games
+         # fit the distribution of the weights to the elite candidates
+         order = sorted(range(args.population), key=lambda i: fitness[i], reverse=True)
+         elite = [population[i] for i in order[:n_elite]]
+         state["mean"], state["std"] = fit_distribution(elite, args.noise)
+         if state["best_fitness"] is None or fitness[order[0]] > state["best_fitness"]:
+            state["best_weights"], state["best_fitness"] = population[order[0]], fitness[order[0]]
+         generation_time = time.perf_counter() - generation_start
+         state["generation"] = generation + 1
+         state["elapsed"] += generation_time
+         state["history"].append({"generation": generation,
+            "mean_fitness": sum(fitness) / args.population,
+            "elite_fitness": sum(fitness[i] for i in order[:n_elite]) / n_elite,
+            "best_fitness": fitness[order[0]], "time": generation_time})
+         save_checkpoint(args.checkpoint, state)
+         elapsed = time.perf_counter() - start_time
+         print("generation %d: mean %.1f, elite %.1f, best %.1f (%.1f s, %.2f generations/hour)"
+               % (generation, state["history"][-1]["mean_fitness"],
+                  state["history"][-1]["elite_fitness"], fitness[order[0]],
+                  generation_time, generations_run * 3600 / elapsed))
+   print("generations: %d (%d workers, %d candidates x %d games, %d x %d, %s)"
+         % (state["generation"], args.workers, args.population, args.games,
+            args.height, args.width, args.game_type))
+   if state["elapsed"] > 0:
+      print("generations/hour: %.2f" % (len(state["history"]) * 3600 / state["elapsed"]))
+   if state["best_fitness"] is not None:
+      print("best fitness: %.1f" % state["best_fitness"])
+      print("best weights: " + json.dumps(state["best_weights"]))
+   print("checkpoint: " + args.checkpoint)
+
+if __name__ == '__main__':
+   main()
\ No newline at end of file
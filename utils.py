@@ -1,3 +1,4 @@
+import functools
 from lib.color import Color
 
 TILE_COLORS = {
@@ -47,6 +48,9 @@ TILE_COLORS = {
         }
 }
 
+# The positions of the next tetromino preview only depend on the grid width, so
+# they are computed once per grid width (the returned dict must not be modified)
+@functools.lru_cache(maxsize=None)
 def get_next_display_dict(grid_width):
     TILE_NEXT_DISPLAY = {
         "I":{